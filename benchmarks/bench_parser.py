@@ -0,0 +1,145 @@
+"""
+torznab解析器性能测试
+
+生成不同规模（默认100、1000、10000条）、是否包含扩展属性、是否包含中日韩标题的合成响应，
+分别使用每个解析后端运行 Jackett._parse_results，输出每秒解析条目数、内存分配和峰值常驻内存，
+并检查所有后端的解析结果完全一致（不一致时退出码为1）。
+
+用法（在仓库根目录）：
+    python -m benchmarks.bench_parser --sizes 100,1000,10000
+"""
+import argparse
+import gc
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fake_jackett import make_feed, make_items
+from benchmarks.harness import load_plugin, peak_rss_mb, report
+
+# 模拟的索引器
+_INDEXER = {"id": "bench", "name": "Bench Indexer"}
+
+
+def _load():
+    """
+    加载插件模块，返回 (模块, 插件实例)
+    """
+    module = sys.modules.get("bench_jackett") or load_plugin("plugins/jackett", "bench_jackett")
+    return module, module.Jackett()
+
+
+def build_feed(size: int, extended: bool, cjk: bool, seed: int = 0) -> bytes:
+    """
+    生成合成torznab响应
+    """
+    rng = random.Random(f"{seed}-{size}-{extended}-{cjk}")
+    return make_feed(make_items("bench", size, rng, shared=size // 3, extended=extended, cjk=cjk),
+                     title="bench")
+
+
+def _record_tuple(record) -> tuple:
+    return tuple(getattr(record, slot) for slot in type(record).__slots__)
+
+
+def _measure(case: dict) -> dict:
+    """
+    测量单个后端解析单个响应，可在独立子进程中运行
+    """
+    _, plugin = _load()
+    plugin._parser = case["backend"]
+    feed = build_feed(case["size"], case["extended"], case["cjk"], case["seed"])
+
+    # 取多次运行中的最短耗时
+    best = float("inf")
+    items = 0
+    for _ in range(case["repeat"]):
+        gc.collect()
+        start = time.perf_counter()
+        records = plugin._parse_results(_INDEXER, feed)
+        best = min(best, time.perf_counter() - start)
+        items = len(records)
+        del records
+
+    # 单独一次运行统计分配
+    gc.collect()
+    tracemalloc.start()
+    records = plugin._parse_results(_INDEXER, feed)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+
+    return {
+        "backend": case["backend"],
+        "items": items,
+        "extended": "yes" if case["extended"] else "no",
+        "cjk": "yes" if case["cjk"] else "no",
+        "feed_kb": len(feed) / 1024,
+        "best_ms": best * 1000,
+        "items_per_s": items / best if best else float("nan"),
+        "alloc_peak_kb": peak / 1024,
+        "retained_kb": retained / 1024,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def check_parity(backends: list, feed: bytes) -> bool:
+    """
+    检查所有后端对同一响应的解析结果完全一致
+    """
+    _, plugin = _load()
+    outputs = []
+    for backend in backends:
+        plugin._parser = backend
+        outputs.append([_record_tuple(record) for record in plugin._parse_results(_INDEXER, feed)])
+    return all(output == outputs[0] for output in outputs[1:])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="torznab解析器性能测试")
+    parser.add_argument("--sizes", default="100,1000,10000", help="条目数，逗号分隔")
+    parser.add_argument("--backends", default="",
+                        help="要测试的解析后端，逗号分隔，默认全部可用后端")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例运行次数，取最短耗时")
+    parser.add_argument("--isolate", action="store_true",
+                        help="每个用例在独立子进程中运行，峰值常驻内存不受其他用例影响")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--json", action="store_true", help="以JSON输出")
+    args = parser.parse_args(argv)
+
+    module, _ = _load()
+    available = list(module.PARSER_BACKENDS)
+    backends = [name for name in args.backends.split(",") if name] or available
+    unknown = [name for name in backends if name not in available]
+    if unknown:
+        parser.error(f"不可用的解析后端: {', '.join(unknown)}，可用: {', '.join(available)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    variants = [(extended, cjk) for extended in (False, True) for cjk in (False, True)]
+    cases = [{"backend": backend, "size": size, "extended": extended, "cjk": cjk,
+              "repeat": max(args.repeat, 1), "seed": args.seed}
+             for size in sizes for extended, cjk in variants for backend in backends]
+
+    # 各后端输出一致性
+    mismatches = [(size, extended, cjk) for size in sizes for extended, cjk in variants
+                  if not check_parity(backends, build_feed(size, extended, cjk, args.seed))]
+
+    if args.isolate:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=1, maxtasksperchild=1) as pool:
+            rows = pool.map(_measure, cases, chunksize=1)
+    else:
+        rows = [_measure(case) for case in cases]
+
+    report("parser", rows, as_json=args.json)
+    if mismatches:
+        for size, extended, cjk in mismatches:
+            print(f"后端输出不一致: items={size} extended={extended} cjk={cjk}", file=sys.stderr)
+        sys.exit(1)
+    print(f"parity: {', '.join(backends)} 输出一致", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Jackett插件搜索性能测试
+
+启动本地模拟的Jackett服务，通过 Jackett.search 发起搜索，
+统计延迟百分位数（p50/p95/p99）、吞吐量和内存峰值。
+
+用法（在仓库根目录）：
+    python -m benchmarks.bench_search --indexers 50 --items 200 --latency lognormal:80,0.6 --failure-rate 0.05
+"""
+import argparse
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_jackett import FakeJackett
+from benchmarks.harness import latency_summary, load_plugin, peak_rss_mb, report
+
+
+def _parse_config(pairs: list) -> dict:
+    """
+    解析 --config key=value，数字自动转换，true/false转换为布尔值
+    """
+    config = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        lowered = value.lower()
+        if lowered in ("true", "false"):
+            config[key] = lowered == "true"
+        else:
+            try:
+                config[key] = int(value)
+            except ValueError:
+                try:
+                    config[key] = float(value)
+                except ValueError:
+                    config[key] = value
+    return config
+
+
+def _run(plugin, keywords: list, concurrency: int) -> tuple:
+    """
+    执行一轮搜索，返回 (每次搜索耗时, 结果总数, 总耗时)
+    """
+    latencies = []
+    results = [0]
+    lock = threading.Lock()
+
+    def _search(keyword):
+        event = {"keyword": keyword}
+        start = time.perf_counter()
+        plugin.search(event)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            results[0] += len(event.get("results") or [])
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        for keyword in keywords:
+            _search(keyword)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(_search, keywords))
+    return latencies, results[0], time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jackett插件搜索性能测试")
+    parser.add_argument("--indexers", type=int, default=20, help="模拟索引器数量")
+    parser.add_argument("--items", type=int, default=100, help="每个索引器的条目数")
+    parser.add_argument("--latency", default="lognormal:50,0.5",
+                        help="延迟分布（毫秒）：fixed:80 / uniform:20-200 / exp:80 / lognormal:80,0.5")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="搜索请求失败概率")
+    parser.add_argument("--failure-mode", choices=("error", "hang"), default="error",
+                        help="失败方式：error 立即返回500，hang 挂起后返回500")
+    parser.add_argument("--overlap", type=float, default=0.3, help="索引器间重复条目比例")
+    parser.add_argument("--iterations", type=int, default=30, help="测量的搜索次数")
+    parser.add_argument("--warmup", type=int, default=3, help="预热搜索次数，不计入统计")
+    parser.add_argument("--concurrency", type=int, default=1, help="同时进行的搜索数")
+    parser.add_argument("--repeat-keyword", action="store_true",
+                        help="每次搜索使用相同关键字（测试缓存命中路径），默认每次不同")
+    parser.add_argument("--memory-iterations", type=int, default=3,
+                        help="开启tracemalloc统计分配峰值的搜索次数，0为跳过")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--config", action="append", metavar="KEY=VALUE",
+                        help="覆盖插件配置，可重复，如 --config cache_ttl=300 --config page_size=0")
+    parser.add_argument("--json", action="store_true", help="以JSON输出")
+    args = parser.parse_args(argv)
+
+    jackett_module = load_plugin("plugins/jackett", "bench_jackett")
+    with FakeJackett(indexers=args.indexers, items=args.items, latency=args.latency,
+                     failure_rate=args.failure_rate, failure_mode=args.failure_mode,
+                     overlap=args.overlap, seed=args.seed) as fake:
+        config = {
+            "enabled": True,
+            "host": fake.host,
+            "api_key": "benchmark",
+            # 默认关闭缓存，测量实际请求路径
+            "cache_ttl": 0,
+            "negative_ttl": 0,
+        }
+        config.update(_parse_config(args.config))
+        plugin = jackett_module.Jackett()
+        plugin.init_plugin(config)
+        try:
+            def _keywords(prefix: str, count: int) -> list:
+                if args.repeat_keyword:
+                    return ["benchmark"] * count
+                return [f"benchmark {prefix} {i}" for i in range(count)]
+
+            _run(plugin, _keywords("warmup", args.warmup), args.concurrency)
+            fake.stats.update(requests=0, search=0, caps=0, failures=0, bytes=0)
+            latencies, results, elapsed = _run(plugin, _keywords("run", args.iterations), args.concurrency)
+            server_stats = dict(fake.stats)
+
+            traced_peak = float("nan")
+            if args.memory_iterations:
+                tracemalloc.start()
+                _run(plugin, _keywords("memory", args.memory_iterations), args.concurrency)
+                traced_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+        finally:
+            plugin.unload_plugin()
+
+    row = {
+        "indexers": args.indexers,
+        "items": args.items,
+        "concurrency": args.concurrency,
+        **latency_summary(latencies),
+        "searches_per_s": len(latencies) / elapsed if elapsed else float("nan"),
+        "results_per_s": results / elapsed if elapsed else float("nan"),
+        "avg_results": results / len(latencies) if latencies else 0,
+        "http_requests": server_stats["requests"],
+        "http_failures": server_stats["failures"],
+        "traced_peak_mb": traced_peak,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    report("search", [row], as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
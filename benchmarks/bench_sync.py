@@ -0,0 +1,138 @@
+"""
+V2插件索引器同步性能测试
+
+使用 benchmarks/stubs 下的MoviePilot替身（SitesHelper、SystemConfigOper、SystemConfigKey、
+IndexerService、EventManager）和本地模拟的Jackett服务，对 plugins.v2/jackett 与
+plugins.v2/jackettv2 的 _add_jackett_indexers 分别测量：
+
+- full：宿主中没有任何Jackett索引器时的首次同步
+- noop：Jackett索引器列表未变化时的再次同步
+
+输出耗时、调用宿主接口的次数和内存峰值。
+
+用法（在仓库根目录）：
+    python -m benchmarks.bench_sync --indexers 10,100,1000,2000
+"""
+import argparse
+import contextlib
+import os
+import time
+import tracemalloc
+
+from benchmarks.fake_jackett import FakeJackett
+from benchmarks.harness import load_plugin, peak_rss_mb, report
+
+# 待测试的插件：名称 -> (目录, 类名)
+PLUGINS = {
+    "jackett": ("plugins.v2/jackett", "Jackett"),
+    "jackettv2": ("plugins.v2/jackettv2", "JackettV2"),
+}
+
+# 单独列出的宿主接口
+_HOST_COLUMNS = (
+    ("get_indexers", "SitesHelper.get_indexers"),
+    ("add_indexer", "SitesHelper.add_indexer"),
+    ("remove_indexer", ("SitesHelper.remove_indexer", "SitesHelper.delete_indexer")),
+    ("config_set", "SystemConfigOper.set"),
+)
+
+
+def _sync(plugin, trace: bool) -> tuple:
+    """
+    执行一次同步，返回 (耗时, 内存峰值MB)；插件日志输出到空设备
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            plugin._add_jackett_indexers()
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024 if trace else float("nan")
+            if trace:
+                tracemalloc.stop()
+    return elapsed, peak
+
+
+def _row(name: str, count: int, phase: str, elapsed: float, peak: float, host) -> dict:
+    calls = dict(host.calls)
+    row = {
+        "plugin": name,
+        "indexers": count,
+        "phase": phase,
+        "wall_ms": elapsed * 1000,
+        "host_calls": sum(calls.values()),
+    }
+    for column, keys in _HOST_COLUMNS:
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        row[column] = sum(calls.get(key, 0) for key in keys)
+    row["registered"] = len(host.indexers)
+    row["traced_peak_mb"] = peak
+    row["peak_rss_mb"] = peak_rss_mb()
+    return row
+
+
+def bench_plugin(name: str, module, fake: FakeJackett, count: int, trace: bool) -> list:
+    """
+    测量单个插件在指定索引器数量下的首次同步和无变化再同步
+    """
+    from app import _bench
+
+    plugin_class = getattr(module, PLUGINS[name][1])
+    config = {"enabled": True, "host": fake.host, "api_key": "benchmark"}
+
+    def _prepare():
+        # 宿主为空、插件未添加过索引器
+        plugin = plugin_class()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            plugin.init_plugin({})
+        plugin._host, plugin._api_key, plugin._indexers = config["host"], config["api_key"], []
+        plugin._added_indexers = []
+        _bench.reset()
+        return plugin
+
+    rows = []
+    plugin = _prepare()
+    elapsed, _ = _sync(plugin, trace=False)
+    rows.append(_row(name, count, "full", elapsed, float("nan"), _bench))
+    _bench.reset(keep_indexers=True)
+    elapsed, _ = _sync(plugin, trace=False)
+    rows.append(_row(name, count, "noop", elapsed, float("nan"), _bench))
+
+    # 单独运行一次统计内存，避免tracemalloc影响耗时
+    if trace:
+        plugin = _prepare()
+        _, peak = _sync(plugin, trace=True)
+        rows[0]["traced_peak_mb"] = peak
+        _bench.reset(keep_indexers=True)
+        _, peak = _sync(plugin, trace=True)
+        rows[1]["traced_peak_mb"] = peak
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="V2插件索引器同步性能测试")
+    parser.add_argument("--indexers", default="10,100,500,1000,2000", help="Jackett索引器数量，逗号分隔")
+    parser.add_argument("--plugins", default=",".join(PLUGINS), help="要测试的插件，逗号分隔")
+    parser.add_argument("--no-memory", action="store_true", help="跳过tracemalloc内存统计")
+    parser.add_argument("--json", action="store_true", help="以JSON输出")
+    args = parser.parse_args(argv)
+
+    names = [name for name in args.plugins.split(",") if name]
+    unknown = [name for name in names if name not in PLUGINS]
+    if unknown:
+        parser.error(f"未知插件: {', '.join(unknown)}，可用: {', '.join(PLUGINS)}")
+    counts = [int(count) for count in args.indexers.split(",") if count]
+
+    modules = {name: load_plugin(PLUGINS[name][0], f"bench_v2_{name}") for name in names}
+    rows = []
+    for count in counts:
+        with FakeJackett(indexers=count, items=0) as fake:
+            for name in names:
+                rows.extend(bench_plugin(name, modules[name], fake, count, trace=not args.no_memory))
+    report("sync", rows, as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
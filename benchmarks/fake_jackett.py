@@ -0,0 +1,302 @@
+"""
+本地模拟的Jackett服务，用于离线性能测试
+
+提供 /UI/Dashboard 登录、/api/v2.0/indexers 索引器列表以及各索引器的
+torznab 搜索（t=search/movie/tvsearch，支持 limit/offset）和能力（t=caps）接口。
+索引器数量、每个索引器的条目数、响应延迟分布和失败率均可配置，
+相同参数和随机种子下生成的数据完全一致。
+"""
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+# torznab命名空间
+TORZNAB_NS = "http://torznab.com/schemas/2015/feed"
+
+# 标题词库，包含中日韩文字以覆盖多字节解码
+_TITLE_WORDS = ["The", "Matrix", "Reloaded", "流浪地球", "三体", "進撃の巨人", "기생충",
+                "2160p", "1080p", "WEB-DL", "BluRay", "HDR", "x265", "DDP5.1", "国语中字"]
+_ASCII_TITLE_WORDS = [word for word in _TITLE_WORDS if word.isascii()]
+
+_CAPS = ('<?xml version="1.0" encoding="UTF-8"?><caps>'
+         '<searching><search available="yes" supportedParams="q"/>'
+         '<movie-search available="yes" supportedParams="q,imdbid,tmdbid"/>'
+         '<tv-search available="yes" supportedParams="q,season,ep,imdbid,tvdbid"/></searching>'
+         '<categories><category id="2000" name="Movies"/><category id="5000" name="TV"/></categories>'
+         '</caps>').encode("utf-8")
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    解析延迟分布，返回以秒为单位的采样函数，单位为毫秒：
+    fixed:80、uniform:20-200、exp:80（指数分布均值）、lognormal:80,0.5（中位数,sigma）
+    """
+    kind, _, args = spec.partition(":")
+    kind = kind.strip().lower()
+    try:
+        if kind == "fixed":
+            value = float(args) / 1000
+            return lambda rng: value
+        if kind == "uniform":
+            low, high = (float(arg) / 1000 for arg in args.split("-", 1))
+            return lambda rng: rng.uniform(low, high)
+        if kind == "exp":
+            mean = float(args) / 1000
+            return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+        if kind == "lognormal":
+            median, sigma = args.split(",", 1)
+            median, sigma = float(median) / 1000, float(sigma)
+            return lambda rng: median * rng.lognormvariate(0, sigma)
+    except ValueError:
+        pass
+    raise ValueError(f"无法识别的延迟分布: {spec}")
+
+
+def make_items(prefix: str, count: int, rng: random.Random, shared: int = 0,
+               extended: bool = True, cjk: bool = True) -> list:
+    """
+    生成torznab条目XML片段列表
+
+    :param prefix: 标题、链接中的索引器标识
+    :param shared: 前多少个条目使用与索引器无关的固定infohash
+    :param extended: 是否包含分类、上传下载系数等扩展属性，否则只有做种数和下载数
+    :param cjk: 标题是否包含中日韩文字
+    """
+    words = _TITLE_WORDS if cjk else _ASCII_TITLE_WORDS
+    items = []
+    for i in range(count):
+        # 前 shared 个条目在所有索引器间共享infohash
+        infohash = f"{i:040x}" if i < shared else f"{rng.getrandbits(160):040x}"
+        title = " ".join(rng.choice(words) for _ in range(6))
+        category = rng.choice((2000, 2040, 2045, 5000, 5040))
+        seeders = int(rng.paretovariate(1.2)) - 1
+        attrs = (f'<torznab:attr name="seeders" value="{seeders}"/>'
+                 f'<torznab:attr name="peers" value="{seeders + rng.randint(0, 50)}"/>')
+        if extended:
+            attrs += (f'<torznab:attr name="category" value="{category}"/>'
+                      f'<torznab:attr name="infohash" value="{infohash}"/>'
+                      f'<torznab:attr name="magneturl" value="magnet:?xt=urn:btih:{infohash}&amp;dn={i}"/>'
+                      f'<torznab:attr name="downloadvolumefactor" value="{rng.choice(("0", "0.5", "1"))}"/>'
+                      '<torznab:attr name="uploadvolumefactor" value="1"/>'
+                      f'<torznab:attr name="imdb" value="{rng.randint(100000, 9999999)}"/>'
+                      f'<torznab:attr name="grabs" value="{rng.randint(0, 5000)}"/>')
+        items.append(
+            "<item>"
+            f"<title>{escape(title)} {prefix}-{i}</title>"
+            f"<guid>https://tracker.example/{prefix}/details/{i}</guid>"
+            f"<link>https://tracker.example/{prefix}/download/{i}?passkey=bench&amp;id={i}</link>"
+            f"<pubDate>Mon, 0{1 + i % 9} Jan 2024 12:00:00 +0000</pubDate>"
+            f"<size>{rng.randint(200, 80000) * 1024 * 1024}</size>"
+            f"<category>{category}</category>"
+            f"{attrs}"
+            "</item>"
+        )
+    return items
+
+
+def make_feed(items: list, title: str = "") -> bytes:
+    """
+    将条目片段拼接为完整的torznab响应
+    """
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<rss version="2.0" xmlns:torznab="{TORZNAB_NS}"><channel>'
+            f'<title>{escape(title)}</title>'
+            + "".join(items)
+            + "</channel></rss>").encode("utf-8")
+
+
+class _Server(ThreadingHTTPServer):
+    """
+    客户端断开连接属于正常情况，不输出异常
+    """
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeJackett:
+    """
+    模拟的Jackett HTTP服务
+
+    :param indexers: 索引器数量
+    :param items: 每个索引器每次搜索可返回的条目总数（按 limit/offset 分页）
+    :param latency: 延迟分布，格式见 parse_latency
+    :param failure_rate: 搜索请求失败的概率
+    :param failure_mode: error 返回HTTP 500，hang 挂起 hang_seconds 秒后再返回500
+    :param overlap: 各索引器之间infohash相同的条目比例，用于测试去重
+    :param seed: 随机种子
+    """
+
+    def __init__(self, indexers: int = 20, items: int = 100, latency: str = "fixed:0",
+                 failure_rate: float = 0.0, failure_mode: str = "error", hang_seconds: float = 30.0,
+                 overlap: float = 0.3, seed: int = 0):
+        self.indexers = [{"id": f"bench{i:04d}", "name": f"Bench Indexer {i}"} for i in range(indexers)]
+        self.items = items
+        self.latency = parse_latency(latency)
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.hang_seconds = hang_seconds
+        self.overlap = overlap
+        self.seed = seed
+        self._items = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._server = None
+        self._thread = None
+        self.stats = {"requests": 0, "search": 0, "caps": 0, "failures": 0, "bytes": 0}
+
+    @property
+    def host(self) -> str:
+        """
+        服务地址
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeJackett":
+        """
+        在后台线程启动服务，监听本机随机端口
+        """
+        fake = self
+
+        class _Handler(_FakeJackettHandler):
+            server_fake = fake
+
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-jackett", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        停止服务
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeJackett":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _rng(self) -> random.Random:
+        """
+        每个服务线程独立的随机数生成器
+        """
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            rng = random.Random(f"{self.seed}-{threading.get_ident()}")
+            self._local.rng = rng
+        return rng
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.stats[name] += value
+
+    def _indexer_items(self, indexer_id: str) -> list:
+        """
+        生成并缓存单个索引器的全部条目XML片段
+        """
+        items = self._items.get(indexer_id)
+        if items is not None:
+            return items
+        rng = random.Random(f"{self.seed}-{indexer_id}")
+        items = make_items(indexer_id, self.items, rng, shared=int(self.items * self.overlap))
+        with self._lock:
+            self._items.setdefault(indexer_id, items)
+        return items
+
+    def feed(self, indexer_id: str, offset: int = 0, limit: Optional[int] = None) -> bytes:
+        """
+        生成索引器一页torznab结果
+        """
+        items = self._indexer_items(indexer_id)
+        end = len(items) if limit is None else offset + limit
+        return make_feed(items[offset:end], title=indexer_id)
+
+
+class _FakeJackettHandler(BaseHTTPRequestHandler):
+    """
+    模拟Jackett的请求处理
+    """
+    protocol_version = "HTTP/1.1"
+    server_fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/xml"):
+        if "gzip" in (self.headers.get("Accept-Encoding") or "") and len(body) > 1024:
+            body = gzip.compress(body, compresslevel=1)
+            self.send_response(status)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server_fake._count("bytes", len(body))
+
+    def do_POST(self):
+        fake = self.server_fake
+        fake._count("requests")
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if urlparse(self.path).path == "/UI/Dashboard":
+            self._send(200, b"ok", "text/html")
+        else:
+            self._send(404, b"", "text/plain")
+
+    def do_GET(self):
+        fake = self.server_fake
+        fake._count("requests")
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+
+        # 索引器列表
+        if url.path == "/api/v2.0/indexers":
+            self._send(200, json.dumps(fake.indexers).encode("utf-8"), "application/json")
+            return
+
+        # 单个索引器的torznab接口
+        if len(parts) == 7 and parts[:3] == ["api", "v2.0", "indexers"] and parts[4:] == ["results", "torznab", "api"]:
+            if params.get("t") == "caps":
+                fake._count("caps")
+                self._send(200, _CAPS)
+                return
+            fake._count("search")
+            rng = fake._rng()
+            time.sleep(fake.latency(rng))
+            if fake.failure_rate and rng.random() < fake.failure_rate:
+                fake._count("failures")
+                if fake.failure_mode == "hang":
+                    time.sleep(fake.hang_seconds)
+                self._send(500, b"Internal Server Error", "text/plain")
+                return
+            try:
+                offset = max(int(params.get("offset") or 0), 0)
+                limit = int(params["limit"]) if params.get("limit") else None
+            except ValueError:
+                self._send(400, b"", "text/plain")
+                return
+            self._send(200, fake.feed(parts[3], offset, limit))
+            return
+
+        self._send(404, b"", "text/plain")
@@ -0,0 +1,105 @@
+"""
+性能测试公共工具：MoviePilot运行环境替身、插件加载、统计与报告
+
+在MoviePilot之外运行时，插件依赖的 app.* 模块由 benchmarks/stubs/app 替身包提供；
+如果当前环境能导入真正的MoviePilot，则直接使用真实模块。
+"""
+import importlib.util
+import json
+import math
+import os
+import sys
+import types
+from typing import Dict, List
+
+# 仓库根目录
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# MoviePilot替身包所在目录
+STUBS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs")
+
+
+def install_app_stub():
+    """
+    使用 benchmarks/stubs 下的 app 替身包，已能导入MoviePilot时不做任何事
+    """
+    if "app" in sys.modules or importlib.util.find_spec("app") is not None:
+        return
+    sys.path.insert(0, STUBS_PATH)
+
+
+def load_plugin(relative_path: str, name: str) -> types.ModuleType:
+    """
+    按目录加载插件模块，目录名可以包含点（如 plugins.v2/jackett）
+    """
+    install_app_stub()
+    path = os.path.join(REPO_ROOT, relative_path, "__init__.py")
+    spec = importlib.util.spec_from_file_location(name, path,
+                                                  submodule_search_locations=[os.path.dirname(path)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    线性插值百分位数
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    """
+    汇总延迟，单位毫秒
+    """
+    return {
+        "count": len(seconds),
+        "mean_ms": sum(seconds) / len(seconds) * 1000 if seconds else float("nan"),
+        "p50_ms": percentile(seconds, 50) * 1000,
+        "p95_ms": percentile(seconds, 95) * 1000,
+        "p99_ms": percentile(seconds, 99) * 1000,
+        "max_ms": max(seconds) * 1000 if seconds else float("nan"),
+    }
+
+
+def peak_rss_mb() -> float:
+    """
+    进程峰值常驻内存（MB），不支持的平台返回nan
+    """
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS为字节，Linux为KB
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def report(title: str, rows: List[Dict], as_json: bool = False):
+    """
+    输出结果：表格或JSON
+    """
+    if as_json:
+        print(json.dumps({"benchmark": title, "results": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"== {title} ==")
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    cells = [[_format(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(cell[i]) for cell in cells)) for i, column in enumerate(columns)]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for cell in cells:
+        print("  ".join(value.rjust(width) for value, width in zip(cell, widths)))
+
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
@@ -0,0 +1,5 @@
+"""
+性能测试使用的MoviePilot替身，只实现插件用到的接口
+
+宿主侧状态和调用计数集中在 app._bench 中，测试脚本通过它重置状态、读取调用次数。
+"""
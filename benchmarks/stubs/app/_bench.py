@@ -0,0 +1,32 @@
+"""
+替身宿主的共享状态：已注册的索引器、系统配置和各接口的调用次数
+"""
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+# 接口调用次数，键为 "类名.方法名"
+calls = Counter()
+# SitesHelper中注册的索引器，domain -> 索引器配置
+indexers = {}
+# SystemConfigOper保存的配置
+system_config = {}
+
+
+def record(name: str):
+    """
+    记录一次宿主接口调用
+    """
+    with _lock:
+        calls[name] += 1
+
+
+def reset(keep_indexers: bool = False):
+    """
+    清空调用计数；keep_indexers为False时同时清空已注册的索引器和系统配置
+    """
+    with _lock:
+        calls.clear()
+        if not keep_indexers:
+            indexers.clear()
+            system_config.clear()
@@ -0,0 +1,26 @@
+from app import _bench
+
+
+class EventManager:
+    """
+    事件管理器替身，同步调用已注册的处理函数
+    """
+
+    def __init__(self):
+        self.handlers = {}
+
+    def register(self, etype, handler):
+        self.handlers.setdefault(etype, []).append(handler)
+
+    def unregister(self, etype, handler):
+        handlers = self.handlers.get(etype) or []
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def send_event(self, etype, data=None):
+        _bench.record("EventManager.send_event")
+        for handler in list(self.handlers.get(etype) or []):
+            handler(data)
+
+
+eventmanager = EventManager()
@@ -0,0 +1,22 @@
+import copy
+
+from app import _bench
+
+
+class SystemConfigOper:
+    """
+    系统配置替身，读写时复制，模拟序列化存储
+    """
+
+    @staticmethod
+    def _key(key):
+        return getattr(key, "value", key)
+
+    def get(self, key):
+        _bench.record("SystemConfigOper.get")
+        return copy.deepcopy(_bench.system_config.get(self._key(key)))
+
+    def set(self, key, value):
+        _bench.record("SystemConfigOper.set")
+        _bench.system_config[self._key(key)] = copy.deepcopy(value)
+        return True
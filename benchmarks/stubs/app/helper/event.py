@@ -0,0 +1,3 @@
+from app.core.event import EventManager
+
+__all__ = ["EventManager"]
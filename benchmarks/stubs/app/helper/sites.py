@@ -0,0 +1,37 @@
+import copy
+
+from app import _bench
+
+
+class SitesHelper:
+    """
+    站点/索引器管理替身，所有实例共享 app._bench.indexers
+
+    与MoviePilot一致，get_indexers 每次返回全部索引器配置的新列表。
+    """
+
+    def get_indexers(self) -> list:
+        _bench.record("SitesHelper.get_indexers")
+        return [copy.copy(indexer) for indexer in _bench.indexers.values()]
+
+    def get_indexer(self, domain: str):
+        _bench.record("SitesHelper.get_indexer")
+        return _bench.indexers.get(domain)
+
+    def add_indexer(self, domain: str, indexer: dict):
+        _bench.record("SitesHelper.add_indexer")
+        _bench.indexers[domain] = indexer
+
+    def remove_indexer(self, domain: str):
+        _bench.record("SitesHelper.remove_indexer")
+        _bench.indexers.pop(domain, None)
+
+    def delete_indexer(self, domain: str):
+        _bench.record("SitesHelper.delete_indexer")
+        _bench.indexers.pop(domain, None)
+
+    def init_indexer(self):
+        _bench.record("SitesHelper.init_indexer")
+
+    def refresh(self):
+        _bench.record("SitesHelper.refresh")
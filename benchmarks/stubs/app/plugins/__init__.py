@@ -0,0 +1,14 @@
+import os
+import tempfile
+
+
+class _PluginBase:
+    """
+    插件基类替身，数据目录放在临时目录下
+    """
+    plugin_name = ""
+
+    def get_data_path(self):
+        path = os.path.join(tempfile.gettempdir(), "moviepilot-bench", type(self).__name__.lower())
+        os.makedirs(path, exist_ok=True)
+        return path
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class EventType(Enum):
+    SearchTorrent = "search.torrent"
+    PluginReload = "plugin.reload"
+    ModuleReload = "module.reload"
+    SiteRefreshed = "site.refreshed"
+    SiteDeleted = "site.deleted"
+
+
+class SystemConfigKey(Enum):
+    UserIndexer = "UserIndexer"
+    IndexerSites = "IndexerSites"
@@ -0,0 +1,13 @@
+from app import _bench
+
+
+class IndexerService:
+    """
+    索引器服务替身，只记录调用
+    """
+
+    def init_indexer(self):
+        _bench.record("IndexerService.init_indexer")
+
+    def refresh(self):
+        _bench.record("IndexerService.refresh")
@@ -0,0 +1,23 @@
+import requests
+
+
+class RequestUtils:
+    """
+    与MoviePilot一致：请求异常时返回None
+    """
+
+    def __init__(self, headers=None, cookies=None, timeout=None, session=None, proxies=None, **kwargs):
+        self._session = session or requests
+        self._kwargs = {"headers": headers, "cookies": cookies, "timeout": timeout or 20, "proxies": proxies}
+
+    def get_res(self, url, params=None, **kwargs):
+        try:
+            return self._session.get(url, params=params, **self._kwargs, **kwargs)
+        except requests.RequestException:
+            return None
+
+    def post_res(self, url, data=None, params=None, **kwargs):
+        try:
+            return self._session.post(url, data=data, params=params, **self._kwargs, **kwargs)
+        except requests.RequestException:
+            return None
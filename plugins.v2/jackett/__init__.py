@@ -3,6 +3,7 @@ from app.plugins import _PluginBase
 from app.utils.http import RequestUtils
 import json
 import os
+import random
 import time
 import xml.dom.minidom
 from urllib.parse import urljoin
@@ -23,7 +24,7 @@ class Jackett(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/Jackett/Jackett/master/src/Jackett.Common/Content/favicon.ico"
     # 插件版本
-    plugin_version = "1.70"
+    plugin_version = "1.73"
     # 插件作者
     plugin_author = "jason"
     # 作者主页
@@ -42,6 +43,15 @@ class Jackett(_PluginBase):
     _password = None
     _indexers = None
     _added_indexers = []
+    # 已添加索引器的配置指纹，用于判断索引器是否需要更新
+    _indexer_fingerprints = {}
+    # 格式化后的索引器：domain -> MoviePilot索引器配置，按索引器目录版本缓存
+    _indexer_index = None
+    _indexer_index_version = None
+    # 获取索引器列表的重试：首次间隔、最大间隔及整体截止时间（秒）
+    _retry_base_delay = 1
+    _retry_max_delay = 8
+    _retry_timeout = 30
     # 会话信息
     _session = None
     _cookies = None
@@ -112,17 +122,18 @@ class Jackett(_PluginBase):
             
             print(f"【{self.plugin_name}】获取到{len(indexers)}个Jackett索引器")
             
-            # 先移除已添加的索引器，避免重复
-            try:
-                self._remove_jackett_indexers()
-            except Exception as e:
-                print(f"【{self.plugin_name}】移除旧索引器异常: {str(e)}")
-            
-            # 清空已添加索引器列表
-            self._added_indexers = []
+            # 期望注册的索引器：domain -> MoviePilot索引器配置
+            desired = self._build_indexer_index(indexers)
             
-            # 存储添加的索引器
-            new_added = []
+            # 与已注册的索引器对比，只处理有变化的部分
+            registered = self._get_registered_indexers(sites_helper)
+            added, updated, removed = self._diff_indexers(desired, registered)
+            print(f"【{self.plugin_name}】索引器对比结果: 新增{len(added)}个，更新{len(updated)}个，"
+                  f"移除{len(removed)}个，未变化{len(desired) - len(added) - len(updated)}个")
+            if not added and not updated and not removed:
+                self._added_indexers = list(desired)
+                print(f"【{self.plugin_name}】索引器无变化，跳过同步")
+                return
             
             # 尝试预先初始化索引器
             try:
@@ -135,71 +146,11 @@ class Jackett(_PluginBase):
             except Exception as e:
                 print(f"【{self.plugin_name}】初始化索引器异常: {str(e)}")
             
-            for indexer in indexers:
-                indexer_id = indexer.get("id")
-                if not indexer_id:
-                    continue
-                    
-                if self._indexers and indexer_id not in self._indexers:
-                    print(f"【{self.plugin_name}】跳过未选择的索引器: {indexer.get('name')}")
-                    continue
-                
-                domain = f"jackett_{indexer_id.lower()}"  # 确保使用小写的ID
-                
-                # 格式化为MoviePilot支持的格式
-                mp_indexer = self._format_indexer(indexer)
-                if not mp_indexer:
-                    continue
-                    
-                # 添加到MoviePilot
-                try:
-                    # 先检查索引器是否已存在
-                    existing_sites = []
-                    if hasattr(sites_helper, "get_indexers"):
-                        existing_sites = sites_helper.get_indexers() or []
-                    elif hasattr(sites_helper, "get_all_indexers"):
-                        existing_sites = sites_helper.get_all_indexers() or []
-                    
-                    if isinstance(existing_sites, dict):
-                        existing_keys = existing_sites.keys()
-                        exists = domain in existing_keys
-                    else:
-                        exists = domain in existing_sites
-                    
-                    if exists:
-                        print(f"【{self.plugin_name}】索引器已存在，先移除: {domain}")
-                        try:
-                            if hasattr(sites_helper, "remove_indexer"):
-                                sites_helper.remove_indexer(domain=domain)
-                            elif hasattr(sites_helper, "delete_indexer"):
-                                sites_helper.delete_indexer(domain=domain)
-                        except Exception as e:
-                            print(f"【{self.plugin_name}】移除已存在索引器失败: {str(e)}")
-                    
-                    # 添加索引器前进行必要准备
-                    print(f"【{self.plugin_name}】尝试添加索引器: {indexer.get('name')} -> {domain}")
-                    
-                    # 注册索引器到系统
-                    try:
-                        # 先尝试直接添加
-                        sites_helper.add_indexer(domain=domain, indexer=mp_indexer)
-                        
-                        # 尝试其他可能的注册方法
-                        if hasattr(sites_helper, "register_indexer"):
-                            sites_helper.register_indexer(domain=domain, url=self._host)
-                        
-                        # 添加到成功列表
-                        self._added_indexers.append(domain)
-                        new_added.append(domain)
-                        print(f"【{self.plugin_name}】成功添加索引器: {indexer.get('name')} -> {domain}")
-                    except Exception as e:
-                        print(f"【{self.plugin_name}】添加索引器失败: {indexer.get('name')} - {str(e)}")
-                        import traceback
-                        print(f"【{self.plugin_name}】添加索引器异常详情: {traceback.format_exc()}")
-                except Exception as e:
-                    print(f"【{self.plugin_name}】添加索引器失败: {indexer.get('name')} - {str(e)}")
+            # 先新增和原位更新，最后移除，同步过程中已有的索引器始终可用
+            failed = self._apply_indexer_changes(sites_helper, desired, added, updated, removed)
+            self._added_indexers = [domain for domain in desired if domain not in failed]
             
-            print(f"【{self.plugin_name}】本次新增{len(new_added)}个索引器，共加入{len(self._added_indexers)}个索引器")
+            print(f"【{self.plugin_name}】本次新增{len(added) - len(failed)}个索引器，共加入{len(self._added_indexers)}个索引器")
             
             # 尝试直接激活索引器，这是关键的一步
             try:
@@ -246,25 +197,18 @@ class Jackett(_PluginBase):
                     
                     print(f"【{self.plugin_name}】当前系统索引器配置: {len(indexers_config)} 个索引器")
                     
-                    # 将新索引器添加到配置中
+                    # 生成新的索引器配置：保留非Jackett索引器，Jackett索引器整体替换为本次结果
+                    indexers_config = {domain: info for domain, info in indexers_config.items()
+                                       if not (isinstance(domain, str) and domain.startswith("jackett_"))
+                                       or domain in desired}
                     indexer_count = 0
                     for domain in self._added_indexers:
-                        # 获取索引器配置
-                        indexer_info = None
-                        for indexer in indexers:
-                            formatted = self._format_indexer(indexer)
-                            if formatted and formatted.get("id", "").lower() == domain.lower():
-                                indexer_info = formatted
-                                break
-                        
-                        if indexer_info:
-                            # 添加到配置中
-                            indexers_config[domain] = indexer_info
-                            indexer_count += 1
-                            print(f"【{self.plugin_name}】直接添加索引器到系统配置: {domain}")
+                        indexers_config[domain] = desired[domain]
+                        indexer_count += 1
+                    print(f"【{self.plugin_name}】直接写入系统配置: {indexer_count} 个Jackett索引器")
                     
-                    # 保存配置
-                    if indexer_count > 0:
+                    # 保存配置，一次写入完成切换
+                    if indexer_count > 0 or removed:
                         # 尝试不同的配置键名来保存
                         save_success = False
                         
@@ -511,6 +455,133 @@ class Jackett(_PluginBase):
         except Exception as e:
             print(f"【{self.plugin_name}】添加Jackett索引器异常: {str(e)}")
     
+    def _build_indexer_index(self, indexers: List[dict]) -> Dict[str, dict]:
+        """
+        将选中的Jackett索引器格式化为 domain -> MoviePilot索引器配置 的索引
+
+        每个索引器只格式化一次；Jackett索引器目录、地址、API Key和选中范围都未变化时直接复用上次结果。
+        """
+        version = (self._host, self._api_key, tuple(sorted(self._indexers or [])),
+                   tuple((indexer.get("id"), indexer.get("name")) for indexer in indexers))
+        if self._indexer_index is not None and self._indexer_index_version == version:
+            return self._indexer_index
+        
+        index = {}
+        for indexer in indexers:
+            indexer_id = indexer.get("id")
+            if not indexer_id:
+                continue
+                
+            if self._indexers and indexer_id not in self._indexers:
+                print(f"【{self.plugin_name}】跳过未选择的索引器: {indexer.get('name')}")
+                continue
+            
+            # 格式化为MoviePilot支持的格式
+            mp_indexer = self._format_indexer(indexer)
+            if mp_indexer:
+                index[f"jackett_{indexer_id.lower()}"] = mp_indexer  # 确保使用小写的ID
+        
+        self._indexer_index = index
+        self._indexer_index_version = version
+        return index
+
+    def _get_registered_indexers(self, sites_helper) -> Dict[str, Optional[dict]]:
+        """
+        一次性获取系统中已注册的Jackett索引器：domain -> 索引器配置（系统未返回配置时为None）
+        只包含系统实际返回的索引器，系统重新加载后丢失的索引器会在下次同步时重新添加
+        """
+        sites = None
+        try:
+            if hasattr(sites_helper, "get_indexers"):
+                sites = sites_helper.get_indexers()
+            elif hasattr(sites_helper, "get_all_indexers"):
+                sites = sites_helper.get_all_indexers()
+        except Exception as e:
+            print(f"【{self.plugin_name}】获取已注册索引器异常: {str(e)}")
+        
+        if isinstance(sites, dict):
+            entries = sites.items()
+        else:
+            entries = ((site.get("id") if isinstance(site, dict) else site, site) for site in sites or [])
+        
+        registered = {}
+        for domain, site in entries:
+            if isinstance(domain, str) and domain.startswith("jackett_"):
+                registered[domain] = site if isinstance(site, dict) else None
+        return registered
+
+    @staticmethod
+    def _indexer_fingerprint(mp_indexer: dict) -> str:
+        """
+        生成索引器配置指纹
+        """
+        return json.dumps(mp_indexer, sort_keys=True, ensure_ascii=False)
+
+    def _diff_indexers(self, desired: Dict[str, dict],
+                       registered: Dict[str, Optional[dict]]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        对比期望的索引器与已注册的索引器，返回 (新增, 更新, 移除) 的domain列表
+
+        是否需要新增只取决于系统是否返回了该索引器；本插件记录的指纹只用于判断系统中已有的索引器是否变化，
+        本插件添加过但系统未返回的索引器只作为移除候选
+        """
+        added = []
+        updated = []
+        for domain, mp_indexer in desired.items():
+            if domain not in registered:
+                added.append(domain)
+                continue
+            # 优先比较本插件记录的指纹，没有记录时比较系统返回的配置
+            fingerprint = self._indexer_fingerprints.get(domain)
+            if fingerprint is not None:
+                changed = fingerprint != self._indexer_fingerprint(mp_indexer)
+            else:
+                changed = registered[domain] != mp_indexer
+            if changed:
+                updated.append(domain)
+        candidates = dict.fromkeys(registered)
+        candidates.update(dict.fromkeys(self._added_indexers))
+        removed = [domain for domain in candidates if domain not in desired]
+        return added, updated, removed
+
+    def _apply_indexer_changes(self, sites_helper, desired: Dict[str, dict],
+                               added: List[str], updated: List[str], removed: List[str]) -> set:
+        """
+        按对比结果新增、原位更新、移除索引器，返回新增失败的domain集合
+        """
+        fingerprints = dict(self._indexer_fingerprints)
+        failed = set()
+        added_set = set(added)
+        for domain in added + updated:
+            mp_indexer = desired[domain]
+            print(f"【{self.plugin_name}】尝试{'添加' if domain in added_set else '更新'}索引器: {mp_indexer.get('name')} -> {domain}")
+            try:
+                sites_helper.add_indexer(domain=domain, indexer=mp_indexer)
+                
+                # 尝试其他可能的注册方法
+                if hasattr(sites_helper, "register_indexer"):
+                    sites_helper.register_indexer(domain=domain, url=self._host)
+                
+                fingerprints[domain] = self._indexer_fingerprint(mp_indexer)
+            except Exception as e:
+                print(f"【{self.plugin_name}】添加索引器失败: {mp_indexer.get('name')} - {str(e)}")
+                if domain in added_set:
+                    failed.add(domain)
+        
+        for domain in removed:
+            try:
+                if hasattr(sites_helper, "remove_indexer"):
+                    sites_helper.remove_indexer(domain=domain)
+                elif hasattr(sites_helper, "delete_indexer"):
+                    sites_helper.delete_indexer(domain=domain)
+                fingerprints.pop(domain, None)
+                print(f"【{self.plugin_name}】移除已不存在的索引器: {domain}")
+            except Exception as e:
+                print(f"【{self.plugin_name}】移除索引器失败: {domain} - {str(e)}")
+        
+        self._indexer_fingerprints = fingerprints
+        return failed
+
     def _fetch_jackett_indexers(self):
         """
         获取Jackett索引器列表，支持重试机制
@@ -523,9 +594,9 @@ class Jackett(_PluginBase):
         if self._host.endswith('/'):
             self._host = self._host[:-1]
             
-        # 设置重试参数
+        # 设置重试参数：最多尝试次数及整体截止时间，重试间隔按指数退避
         max_retries = 3
-        retry_interval = 5
+        retry_deadline = time.monotonic() + self._retry_timeout
         current_try = 1
             
         try:
@@ -608,25 +679,37 @@ class Jackett(_PluginBase):
                     else:
                         print(f"【{self.plugin_name}】获取索引器列表失败: 无响应")
                     
-                    if current_try < max_retries:
-                        print(f"【{self.plugin_name}】{retry_interval}秒后进行第{current_try + 1}次重试...")
-                        time.sleep(retry_interval)
+                    if current_try < max_retries and not self._wait_before_retry(current_try, retry_deadline):
+                        break
                     current_try += 1
                     
                 except Exception as e:
                     print(f"【{self.plugin_name}】请求索引器列表异常: {str(e)}")
-                    if current_try < max_retries:
-                        print(f"【{self.plugin_name}】{retry_interval}秒后进行第{current_try + 1}次重试...")
-                        time.sleep(retry_interval)
+                    if current_try < max_retries and not self._wait_before_retry(current_try, retry_deadline):
+                        break
                     current_try += 1
             
-            print(f"【{self.plugin_name}】在{max_retries}次尝试后仍未能获取索引器列表")
+            print(f"【{self.plugin_name}】在{min(current_try, max_retries)}次尝试后仍未能获取索引器列表")
             return []
                 
         except Exception as e:
             print(f"【{self.plugin_name}】获取Jackett索引器异常: {str(e)}")
             return []
     
+    def _wait_before_retry(self, attempt: int, deadline: float) -> bool:
+        """
+        第attempt次尝试失败后按带抖动的指数退避等待，等待后会超过截止时间时不再重试，返回False
+        """
+        delay = min(self._retry_base_delay * 2 ** (attempt - 1), self._retry_max_delay)
+        # 等待时间在 [delay/2, delay] 之间随机，避免多个实例同时重试
+        delay = random.uniform(delay / 2, delay)
+        if time.monotonic() + delay > deadline:
+            print(f"【{self.plugin_name}】已超过重试截止时间，不再重试")
+            return False
+        print(f"【{self.plugin_name}】{delay:.1f}秒后进行第{attempt + 1}次重试...")
+        time.sleep(delay)
+        return True
+
     def _format_indexer(self, jackett_indexer):
         """
         将Jackett索引器格式化为MoviePilot索引器格式
@@ -1099,13 +1182,10 @@ class Jackett(_PluginBase):
             
             # 尝试添加索引器
             try:
+                index = self._build_indexer_index(indexers)
+                
                 # 添加到成功列表
-                for indexer in indexers:
-                    if self._indexers and indexer.get("id") not in self._indexers:
-                        continue
-                    
-                    domain = f"jackett_{indexer.get('id', '').lower()}"
-                    self._added_indexers.append(domain)
+                self._added_indexers = list(index)
                 
                 # 直接修改数据库和配置文件
                 success = self._direct_modify_config_file(indexers)
@@ -1113,46 +1193,26 @@ class Jackett(_PluginBase):
                     print(f"【{self.plugin_name}】成功通过直接修改配置添加{len(self._added_indexers)}个索引器")
                 else:
                     # 尝试通过标准API添加
-                    for indexer in indexers:
-                        indexer_id = indexer.get("id")
-                        if not indexer_id:
-                            continue
-                            
-                        if self._indexers and indexer_id not in self._indexers:
-                            continue
-                        
-                        domain = f"jackett_{indexer_id.lower()}"
-                        
-                        # 格式化为MoviePilot支持的格式
-                        mp_indexer = self._format_indexer(indexer)
-                        if not mp_indexer:
-                            continue
-                            
+                    sites_helper = None
+                    try:
+                        # 尝试 V2 版本的导入路径
+                        from app.helper.sites import SitesHelper
+                        sites_helper = SitesHelper()
+                        print(f"【{self.plugin_name}】成功导入SitesHelper (V2路径)")
+                    except ImportError:
                         try:
-                            # 导入 SitesHelper
-                            sites_helper = None
+                            # 尝试 V1 版本的导入路径
+                            from app.sites import SitesHelper
+                            sites_helper = SitesHelper()
+                            print(f"【{self.plugin_name}】成功导入SitesHelper (V1路径)")
+                        except ImportError:
+                            print(f"【{self.plugin_name}】无法导入SitesHelper")
+                    
+                    if sites_helper:
+                        # 一次性获取已存在的索引器
+                        existing_sites = self._get_registered_indexers(sites_helper)
+                        for domain, mp_indexer in index.items():
                             try:
-                                # 尝试 V2 版本的导入路径
-                                from app.helper.sites import SitesHelper
-                                sites_helper = SitesHelper()
-                                print(f"【{self.plugin_name}】成功导入SitesHelper (V2路径)")
-                            except ImportError:
-                                try:
-                                    # 尝试 V1 版本的导入路径
-                                    from app.sites import SitesHelper
-                                    sites_helper = SitesHelper()
-                                    print(f"【{self.plugin_name}】成功导入SitesHelper (V1路径)")
-                                except ImportError:
-                                    print(f"【{self.plugin_name}】无法导入SitesHelper")
-                            
-                            if sites_helper:
-                                # 检查索引器是否已存在
-                                existing_sites = []
-                                if hasattr(sites_helper, "get_indexers"):
-                                    existing_sites = sites_helper.get_indexers() or []
-                                elif hasattr(sites_helper, "get_all_indexers"):
-                                    existing_sites = sites_helper.get_all_indexers() or []
-                                
                                 # 如果索引器已存在，先移除
                                 if domain in existing_sites:
                                     if hasattr(sites_helper, "remove_indexer"):
@@ -1163,9 +1223,9 @@ class Jackett(_PluginBase):
                                 # 添加索引器
                                 if hasattr(sites_helper, "add_indexer"):
                                     sites_helper.add_indexer(domain=domain, indexer=mp_indexer)
-                                    print(f"【{self.plugin_name}】成功添加索引器: {indexer.get('name')}")
-                        except Exception as e:
-                            print(f"【{self.plugin_name}】添加索引器失败: {str(e)}")
+                                    print(f"【{self.plugin_name}】成功添加索引器: {mp_indexer.get('name')}")
+                            except Exception as e:
+                                print(f"【{self.plugin_name}】添加索引器失败: {str(e)}")
                 
                 # 如果当前系统中索引器为0，尝试通过更新配置文件时间戳等方式强制系统重新加载
                 sites_helper = None
@@ -1452,15 +1512,7 @@ class Jackett(_PluginBase):
             import json
             
             # 格式化所有需要的索引器
-            formatted_indexers = {}
-            for indexer in indexers:
-                if self._indexers and indexer.get("id") not in self._indexers:
-                    continue
-                    
-                formatted = self._format_indexer(indexer)
-                if formatted:
-                    indexer_id = formatted["id"]
-                    formatted_indexers[indexer_id] = formatted
+            formatted_indexers = self._build_indexer_index(indexers)
                     
             if not formatted_indexers:
                 print(f"【{self.plugin_name}】没有有效的索引器可添加")
@@ -1625,6 +1677,9 @@ class Jackett(_PluginBase):
             import time
             import sqlite3
             
+            # 格式化所有需要的索引器，后续写入各处配置时复用
+            formatted_indexers = self._build_indexer_index(indexers)
+            
             # 尝试多种方法来强制刷新索引器
             
             # 1. 尝试直接修改数据库
@@ -1709,13 +1764,8 @@ class Jackett(_PluginBase):
                                                         del existing_config[jackett_key]
                                                 
                                                 # 添加新的Jackett索引器
-                                                added_count = 0
-                                                for indexer in indexers:
-                                                    formatted = self._format_indexer(indexer)
-                                                    if formatted:
-                                                        indexer_id = formatted["id"]
-                                                        existing_config[indexer_id] = formatted
-                                                        added_count += 1
+                                                existing_config.update(formatted_indexers)
+                                                added_count = len(formatted_indexers)
                                                 
                                                 # 更新配置
                                                 new_value = json.dumps(existing_config, ensure_ascii=False)
@@ -1744,15 +1794,8 @@ class Jackett(_PluginBase):
                                     if not found_indexer_config:
                                         try:
                                             # 准备新配置
-                                            new_config = {}
-                                            added_count = 0
-                                            
-                                            for indexer in indexers:
-                                                formatted = self._format_indexer(indexer)
-                                                if formatted:
-                                                    indexer_id = formatted["id"]
-                                                    new_config[indexer_id] = formatted
-                                                    added_count += 1
+                                            new_config = dict(formatted_indexers)
+                                            added_count = len(new_config)
                                             
                                             # 插入新配置
                                             new_value = json.dumps(new_config, ensure_ascii=False)
@@ -1835,13 +1878,8 @@ class Jackett(_PluginBase):
                         print(f"【{self.plugin_name}】在配置中创建新的索引器部分: {indexer_section}")
                     
                     # 准备所有索引器
-                    indexer_count = 0
-                    for indexer in indexers:
-                        formatted = self._format_indexer(indexer)
-                        if formatted:
-                            indexer_id = formatted["id"]
-                            config_data[indexer_section][indexer_id] = formatted
-                            indexer_count += 1
+                    config_data[indexer_section].update(formatted_indexers)
+                    indexer_count = len(formatted_indexers)
                     
                     print(f"【{self.plugin_name}】添加了 {indexer_count} 个索引器到配置")
                     
@@ -3,6 +3,7 @@ from app.plugins import _PluginBase
 from app.utils.http import RequestUtils
 import json
 import os
+import random
 import time
 import xml.dom.minidom
 from urllib.parse import urljoin
@@ -19,7 +20,7 @@ class JackettV2(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/Jackett/Jackett/master/src/Jackett.Common/Content/favicon.ico"
     # 插件版本
-    plugin_version = "1.6"
+    plugin_version = "1.8"
     # 插件作者
     plugin_author = "jason"
     # 作者主页
@@ -38,6 +39,12 @@ class JackettV2(_PluginBase):
     _password = None
     _indexers = None
     _added_indexers = []
+    # 已添加索引器的配置指纹，用于判断索引器是否需要更新
+    _indexer_fingerprints = {}
+    # 等待索引器生效：轮询首次间隔、最大间隔及超时时间（秒）
+    _ready_poll_delay = 0.05
+    _ready_poll_max_delay = 1
+    _ready_timeout = 5
     # 会话信息
     _session = None
     _cookies = None
@@ -468,16 +475,8 @@ class JackettV2(_PluginBase):
             
             print(f"【{self.plugin_name}】获取到{len(indexers)}个Jackett索引器")
             
-            # 先移除已添加的索引器
-            self._remove_jackett_indexers()
-            
-            # 等待1秒确保删除操作完成
-            time.sleep(1)
-            
-            # 清空已添加索引器列表
-            self._added_indexers = []
-            
-            # 添加索引器
+            # 期望注册的索引器：domain -> MoviePilot索引器配置
+            desired = {}
             for indexer in indexers:
                 indexer_id = indexer.get("id")
                 if not indexer_id:
@@ -490,27 +489,34 @@ class JackettV2(_PluginBase):
                 domain = f"jackett_{indexer_id.lower()}"
                 
                 # 检查是否已经添加过
-                if domain in self._added_indexers:
+                if domain in desired:
                     print(f"【{self.plugin_name}】索引器已存在，跳过: {indexer.get('name')}")
                     continue
                 
                 # 格式化为MoviePilot支持的格式
                 mp_indexer = self._format_indexer(indexer)
-                if not mp_indexer:
-                    continue
-                    
-                try:
-                    # 添加到MoviePilot
-                    sites_helper.add_indexer(domain=domain, indexer=mp_indexer)
-                    self._added_indexers.append(domain)
-                    print(f"【{self.plugin_name}】成功添加索引器: {indexer.get('name')}")
-                except Exception as e:
-                    print(f"【{self.plugin_name}】添加索引器失败: {indexer.get('name')} - {str(e)}")
+                if mp_indexer:
+                    desired[domain] = mp_indexer
+            
+            # 与已注册的索引器对比，只处理有变化的部分
+            registered = self._get_registered_indexers(sites_helper)
+            added, updated, removed = self._diff_indexers(desired, registered)
+            print(f"【{self.plugin_name}】新增{len(added)}个，更新{len(updated)}个，移除{len(removed)}个，"
+                  f"未变化{len(desired) - len(added) - len(updated)}个索引器")
+            if not added and not updated and not removed:
+                self._added_indexers = list(desired)
+                return
+            
+            # 先新增和原位更新，最后移除，同步过程中已有的索引器始终可用
+            failed = self._apply_indexer_changes(sites_helper, desired, added, updated, removed)
+            self._added_indexers = [domain for domain in desired if domain not in failed]
             
             print(f"【{self.plugin_name}】共添加了{len(self._added_indexers)}个索引器")
             
-            # 等待1秒确保添加操作完成
-            time.sleep(1)
+            # 等待成功的新增和移除在系统索引器中生效，失败的索引器不参与判断
+            self._wait_indexers_ready(sites_helper,
+                                      present=[domain for domain in added + updated if domain not in failed],
+                                      absent=[domain for domain in removed if domain not in failed])
             
             # 尝试多种方式刷新索引器以确保立即生效
             try:
@@ -542,8 +548,6 @@ class JackettV2(_PluginBase):
                             # 更新文件时间戳
                             os.utime(config_file, None)
                             print(f"【{self.plugin_name}】已更新{config_file}时间戳以触发重载")
-                            # 确保文件变更被检测到
-                            time.sleep(0.5)
                         except Exception as e:
                             print(f"【{self.plugin_name}】更新{config_file}时间戳失败: {str(e)}")
                 
@@ -563,6 +567,140 @@ class JackettV2(_PluginBase):
             import traceback
             print(f"【{self.plugin_name}】异常详情: {traceback.format_exc()}")
 
+    def _get_registered_indexers(self, sites_helper) -> Dict[str, Optional[dict]]:
+        """
+        一次性获取系统中已注册的Jackett索引器：domain -> 索引器配置（系统未返回配置时为None）
+        只包含系统实际返回的索引器，系统重新加载后丢失的索引器会在下次同步时重新添加
+        """
+        sites = None
+        try:
+            if hasattr(sites_helper, 'get_indexers'):
+                sites = sites_helper.get_indexers()
+        except Exception as e:
+            print(f"【{self.plugin_name}】获取已注册索引器异常: {str(e)}")
+        
+        if isinstance(sites, dict):
+            entries = sites.items()
+        else:
+            entries = ((site.get("id") if isinstance(site, dict) else site, site) for site in sites or [])
+        
+        registered = {}
+        for domain, site in entries:
+            if isinstance(domain, str) and domain.startswith("jackett_"):
+                registered[domain] = site if isinstance(site, dict) else None
+        return registered
+
+    @staticmethod
+    def _indexer_fingerprint(mp_indexer: dict) -> str:
+        """
+        生成索引器配置指纹
+        """
+        return json.dumps(mp_indexer, sort_keys=True, ensure_ascii=False)
+
+    def _diff_indexers(self, desired: Dict[str, dict],
+                       registered: Dict[str, Optional[dict]]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        对比期望的索引器与已注册的索引器，返回 (新增, 更新, 移除) 的domain列表
+
+        是否需要新增只取决于系统是否返回了该索引器；本插件记录的指纹只用于判断系统中已有的索引器是否变化，
+        本插件添加过但系统未返回的索引器只作为移除候选
+        """
+        added = []
+        updated = []
+        for domain, mp_indexer in desired.items():
+            if domain not in registered:
+                added.append(domain)
+                continue
+            # 优先比较本插件记录的指纹，没有记录时比较系统返回的配置
+            fingerprint = self._indexer_fingerprints.get(domain)
+            if fingerprint is not None:
+                changed = fingerprint != self._indexer_fingerprint(mp_indexer)
+            else:
+                changed = registered[domain] != mp_indexer
+            if changed:
+                updated.append(domain)
+        candidates = dict.fromkeys(registered)
+        candidates.update(dict.fromkeys(self._added_indexers))
+        removed = [domain for domain in candidates if domain not in desired]
+        return added, updated, removed
+
+    def _apply_indexer_changes(self, sites_helper, desired: Dict[str, dict],
+                               added: List[str], updated: List[str], removed: List[str]) -> set:
+        """
+        按对比结果新增、原位更新、移除索引器，返回新增或移除失败的domain集合
+        """
+        fingerprints = dict(self._indexer_fingerprints)
+        failed = set()
+        added_set = set(added)
+        for domain in added + updated:
+            mp_indexer = desired[domain]
+            try:
+                # add_indexer对已存在的domain直接覆盖，不需要先移除
+                sites_helper.add_indexer(domain=domain, indexer=mp_indexer)
+                fingerprints[domain] = self._indexer_fingerprint(mp_indexer)
+                print(f"【{self.plugin_name}】成功{'添加' if domain in added_set else '更新'}索引器: {mp_indexer.get('name')}")
+            except Exception as e:
+                print(f"【{self.plugin_name}】添加索引器失败: {mp_indexer.get('name')} - {str(e)}")
+                if domain in added_set:
+                    failed.add(domain)
+        
+        for domain in removed:
+            try:
+                if hasattr(sites_helper, 'delete_indexer'):
+                    sites_helper.delete_indexer(domain=domain)
+                elif hasattr(sites_helper, 'remove_indexer'):
+                    sites_helper.remove_indexer(domain=domain)
+                else:
+                    print(f"【{self.plugin_name}】系统不支持移除索引器，跳过: {domain}")
+                    failed.add(domain)
+                    continue
+                fingerprints.pop(domain, None)
+                print(f"【{self.plugin_name}】成功移除索引器: {domain}")
+            except Exception as e:
+                print(f"【{self.plugin_name}】移除索引器失败: {domain} - {str(e)}")
+                failed.add(domain)
+        
+        self._indexer_fingerprints = fingerprints
+        return failed
+
+    def _wait_until(self, condition, timeout: float) -> bool:
+        """
+        以带抖动的指数退避轮询condition，直到返回True或超过timeout秒
+        """
+        deadline = time.monotonic() + timeout
+        delay = self._ready_poll_delay
+        while True:
+            if condition():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # 等待时间在 [delay/2, delay] 之间随机，并且不超过截止时间
+            time.sleep(min(random.uniform(delay / 2, delay), remaining))
+            delay = min(delay * 2, self._ready_poll_max_delay)
+
+    def _wait_indexers_ready(self, sites_helper, present: List[str], absent: List[str]) -> bool:
+        """
+        轮询系统索引器，直到新增/更新的索引器都可见、移除的索引器都已消失，
+        生效后立即返回，超时则继续后续刷新流程
+        """
+        if not hasattr(sites_helper, 'get_indexers'):
+            return False
+        present = set(present)
+        absent = set(absent)
+
+        def _ready() -> bool:
+            registered = self._get_registered_indexers(sites_helper)
+            return present.issubset(registered) and absent.isdisjoint(registered)
+
+        start = time.monotonic()
+        ready = self._wait_until(_ready, self._ready_timeout)
+        if ready:
+            print(f"【{self.plugin_name}】索引器已生效，耗时{time.monotonic() - start:.2f}秒")
+        else:
+            print(f"【{self.plugin_name}】等待索引器生效超时（{self._ready_timeout}秒），继续刷新")
+        return ready
+
     def get_indexers(self):
         """
         获取索引器列表
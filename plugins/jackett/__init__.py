@@ -1,11 +1,1178 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from email.utils import parsedate_to_datetime
+import base64
+import binascii
+import heapq
+import io
 import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
 import time
+import unicodedata
+import xml.etree.ElementTree as ET
+import zlib
+import requests
+from requests.adapters import HTTPAdapter
 from app.plugins import _PluginBase
 from app.core.event import eventmanager
 from app.schemas.types import EventType
 from app.utils.http import RequestUtils
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# torznab命名空间
+_TORZNAB_NS = "http://torznab.com/schemas/2015/feed"
+# torznab扩展属性标签
+_TORZNAB_ATTR = f"{{{_TORZNAB_NS}}}attr"
+# 磁力链接中的infohash
+_BTIH_RE = re.compile(r"xt=urn:btih:([0-9A-Za-z]+)", re.IGNORECASE)
+# 关键字中直接删除的字符（撇号）
+_QUERY_DROP_RE = re.compile(r"['’`]")
+# 关键字中替换为空格的字符（除文字、数字外的标点符号）
+_QUERY_PUNCT_RE = re.compile(r"[^\w\s]|_")
+
+
+def canonicalize_query(keyword: str) -> str:
+    """
+    规范化搜索关键字：全角转半角（NFKC）、忽略大小写、标点替换为空格、合并连续空白
+    """
+    text = unicodedata.normalize("NFKC", str(keyword)).casefold()
+    text = _QUERY_DROP_RE.sub("", text)
+    text = _QUERY_PUNCT_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def _iter_items_stdlib(source, predicate=None):
+    """
+    使用标准库iterparse逐个解析torznab条目，
+    生成 (title, link, size, seeders, peers, guid, infohash, magneturl, pubdate)
+
+    predicate(size, seeders, categories) 在读取扩展属性和大小后调用，
+    返回False时跳过该条目，不再读取标题、链接等其余字段。
+    根元素不是rss（如HTML页面、Jackett错误信息）时抛出ValueError。
+    """
+    root = None
+    channel = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                _check_root(elem)
+                root = elem
+            elif elem.tag == "channel" and channel is None:
+                channel = elem
+            continue
+        if elem.tag != "item":
+            continue
+
+        # 获取种子和做种数
+        seeders = 0
+        peers = 0
+        infohash = ""
+        magneturl = ""
+        categories = [] if predicate else None
+        for attr in elem.iterfind(_TORZNAB_ATTR):
+            name = attr.get("name")
+            if name == "seeders":
+                seeders = int(attr.get("value", 0))
+            elif name == "peers":
+                peers = int(attr.get("value", 0))
+            elif name == "infohash":
+                infohash = attr.get("value", "")
+            elif name == "magneturl":
+                magneturl = attr.get("value", "")
+            elif name == "category" and categories is not None:
+                categories.append(attr.get("value"))
+        size = int(elem.findtext("size") or 0)
+        if predicate:
+            if not categories:
+                categories = [cat.text for cat in elem.iterfind("category")]
+            accepted = predicate(size, seeders, categories)
+        else:
+            accepted = True
+        if accepted:
+            yield (elem.findtext("title") or "",
+                   elem.findtext("link") or "",
+                   size,
+                   seeders,
+                   peers,
+                   elem.findtext("guid") or "",
+                   infohash,
+                   magneturl,
+                   elem.findtext("pubDate") or "")
+
+        # 释放已解析的条目
+        container = channel if channel is not None else root
+        container.clear()
+
+
+def _check_root(root):
+    """
+    检查响应根元素是否为torznab的rss
+    """
+    if root is None:
+        raise ValueError("响应为空")
+    if root.tag != "rss":
+        description = root.get("description")
+        raise ValueError(f"非torznab响应: <{root.tag}>{f' {description}' if description else ''}")
+
+
+if lxml_etree is not None:
+    _LXML_TITLE = lxml_etree.XPath("string(title)", smart_strings=False)
+    _LXML_LINK = lxml_etree.XPath("string(link)", smart_strings=False)
+    _LXML_SIZE = lxml_etree.XPath("string(size)", smart_strings=False)
+    _LXML_GUID = lxml_etree.XPath("string(guid)", smart_strings=False)
+    _LXML_PUBDATE = lxml_etree.XPath("string(pubDate)", smart_strings=False)
+    _LXML_CATEGORIES = lxml_etree.XPath("category/text()", smart_strings=False)
+    _LXML_ATTRS = lxml_etree.XPath("torznab:attr", namespaces={"torznab": _TORZNAB_NS})
+
+
+def _iter_items_lxml(source, predicate=None):
+    """
+    使用lxml iterparse和预编译XPath逐个解析torznab条目，输出及predicate用法与标准库版本一致
+    """
+    context = lxml_etree.iterparse(source, events=("end",), tag="item")
+    for _, elem in context:
+        # 获取种子和做种数
+        seeders = 0
+        peers = 0
+        infohash = ""
+        magneturl = ""
+        categories = [] if predicate else None
+        for attr in _LXML_ATTRS(elem):
+            name = attr.get("name")
+            if name == "seeders":
+                seeders = int(attr.get("value", 0))
+            elif name == "peers":
+                peers = int(attr.get("value", 0))
+            elif name == "infohash":
+                infohash = attr.get("value", "")
+            elif name == "magneturl":
+                magneturl = attr.get("value", "")
+            elif name == "category" and categories is not None:
+                categories.append(attr.get("value"))
+        size = int(_LXML_SIZE(elem) or 0)
+        if predicate:
+            if not categories:
+                categories = _LXML_CATEGORIES(elem)
+            accepted = predicate(size, seeders, categories)
+        else:
+            accepted = True
+        if accepted:
+            yield (_LXML_TITLE(elem),
+                   _LXML_LINK(elem),
+                   size,
+                   seeders,
+                   peers,
+                   _LXML_GUID(elem),
+                   infohash,
+                   magneturl,
+                   _LXML_PUBDATE(elem))
+
+        # 释放已解析的条目及其之前的兄弟节点
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    _check_root(context.root)
+
+
+# 可用的torznab解析后端
+PARSER_BACKENDS = {"stdlib": _iter_items_stdlib}
+if lxml_etree is not None:
+    PARSER_BACKENDS["lxml"] = _iter_items_lxml
+
+
+class _TorrentRecord:
+    """
+    紧凑的搜索结果记录，站点名和索引器ID为驻留字符串，仅在交给MoviePilot时转换为字典
+    """
+    __slots__ = ("title", "enclosure", "size", "seeders", "peers", "site", "indexer", "guid", "infohash",
+                 "pubdate")
+
+    def __init__(self, title: str, enclosure: str, size: int, seeders: int, peers: int,
+                 site: str, indexer: str, guid: str = "", infohash: str = "", pubdate: str = ""):
+        self.title = title
+        self.enclosure = enclosure
+        self.size = size
+        self.seeders = seeders
+        self.peers = peers
+        self.site = site
+        self.indexer = indexer
+        self.guid = guid
+        self.infohash = infohash
+        self.pubdate = pubdate
+
+    def size_of(self) -> int:
+        """
+        估算记录独占的字节数，驻留字符串不计入
+        """
+        return (sys.getsizeof(self) + sys.getsizeof(self.title) + sys.getsizeof(self.enclosure)
+                + sys.getsizeof(self.guid) + sys.getsizeof(self.infohash) + sys.getsizeof(self.pubdate))
+
+    def dedup_key(self) -> tuple:
+        """
+        去重键：优先infohash，其次guid，最后使用规范化标题+大小
+        """
+        if self.infohash:
+            return "infohash", self.infohash
+        if self.guid:
+            return "guid", self.guid
+        return "title", " ".join(self.title.lower().split()), self.size
+
+    def merge(self, other: "_TorrentRecord") -> "_TorrentRecord":
+        """
+        合并重复记录，返回做种数和下载数取较大值的新记录
+        """
+        return _TorrentRecord(self.title, self.enclosure, self.size,
+                              max(self.seeders, other.seeders), max(self.peers, other.peers),
+                              self.site, self.indexer, self.guid, self.infohash, self.pubdate)
+
+    def to_dict(self) -> dict:
+        """
+        转换为MoviePilot搜索结果格式
+        """
+        return {
+            "title": self.title,
+            "enclosure": self.enclosure,
+            "size": self.size,
+            "seeders": self.seeders,
+            "peers": self.peers,
+            "site": self.site,
+            "indexer": self.indexer,
+            "category": ""
+        }
+
+
+def _normalize_infohash(infohash: str, magneturl: str = "") -> str:
+    """
+    规范化infohash为小写十六进制，缺失时从磁力链接中提取
+    """
+    if not infohash and magneturl:
+        match = _BTIH_RE.search(magneturl)
+        if match:
+            infohash = match.group(1)
+    if not infohash:
+        return ""
+    if len(infohash) == 32:
+        # base32编码的infohash
+        try:
+            return base64.b32decode(infohash.upper()).hex()
+        except (binascii.Error, ValueError):
+            return infohash.lower()
+    return infohash.lower()
+
+
+class _PartialResults(list):
+    """
+    分页请求中后续页失败时已获取的结果，可以返回给本次搜索，但不写入缓存
+    """
+
+
+class _ResultMerger:
+    """
+    跨索引器合并搜索结果
+
+    以去重键建立哈希索引，重复的结果只保留首次出现的一条并合并做种数，整体为线性复杂度。
+    流式返回时通过 track 记录已发布的字典，后续合并的做种数会同步更新到已发布的结果中。
+    """
+
+    def __init__(self, dedup: bool = True):
+        self.dedup = dedup
+        self.records = []
+        self._index = {}
+        self._published = {}
+
+    def add(self, records: list) -> list:
+        """
+        合并一批记录，返回其中首次出现的记录
+        """
+        if not self.dedup:
+            self.records.extend(records)
+            return records
+        added = []
+        for record in records:
+            key = record.dedup_key()
+            pos = self._index.get(key)
+            if pos is None:
+                self._index[key] = len(self.records)
+                self.records.append(record)
+                added.append(record)
+                continue
+            kept = self.records[pos]
+            if record.seeders > kept.seeders or record.peers > kept.peers:
+                merged = kept.merge(record)
+                self.records[pos] = merged
+                published = self._published.get(key)
+                if published is not None:
+                    published["seeders"] = merged.seeders
+                    published["peers"] = merged.peers
+        return added
+
+    def track(self, record: _TorrentRecord, item: dict):
+        """
+        记录已发布的结果字典
+        """
+        if self.dedup:
+            self._published[record.dedup_key()] = item
+
+    def results(self) -> list:
+        """
+        获取合并后的全部结果
+        """
+        return self.records
+
+
+class _ResultScorer:
+    """
+    结果评分：做种数、与目标大小的接近程度、发布时间新鲜度的加权和
+    """
+
+    def __init__(self, seeders: float = 1.0, size: float = 0.0, fresh: float = 0.0,
+                 preferred_size: int = 0):
+        self.seeders_weight = seeders
+        self.size_weight = size
+        self.fresh_weight = fresh
+        self.preferred_size = preferred_size
+
+    def __call__(self, record: _TorrentRecord) -> float:
+        score = 0.0
+        if self.seeders_weight:
+            score += self.seeders_weight * math.log1p(max(record.seeders, 0))
+        if self.size_weight and self.preferred_size and record.size > 0:
+            # 与目标大小的对数距离，相差20倍以上不得分
+            distance = abs(math.log(record.size / self.preferred_size))
+            score += self.size_weight * max(0.0, 1 - distance / 3)
+        if self.fresh_weight and record.pubdate:
+            try:
+                published = parsedate_to_datetime(record.pubdate).timestamp()
+            except (TypeError, ValueError):
+                published = None
+            if published is not None:
+                age_days = max(time.time() - published, 0) / 86400
+                score += self.fresh_weight * math.exp(-age_days / 30)
+        return score
+
+
+class _TopKMerger(_ResultMerger):
+    """
+    只保留评分最高的K条结果的合并器
+
+    以小顶堆维护当前最好的K条结果，新结果评分不高于堆顶时直接丢弃，
+    去重索引只覆盖堆中的结果，因此内存占用与返回的索引器数量无关。
+    """
+
+    def __init__(self, k: int, scorer: _ResultScorer, dedup: bool = True):
+        super().__init__(dedup=dedup)
+        self.k = k
+        self.scorer = scorer
+        self._heap = []
+        self._entries = {}
+        self._seq = 0
+
+    def add(self, records: list) -> list:
+        """
+        合并一批记录，返回其中进入前K的记录
+        """
+        added = []
+        for record in records:
+            self._seq += 1
+            key = record.dedup_key() if self.dedup else self._seq
+            entry = self._entries.get(key)
+            if entry is not None:
+                kept = entry[3]
+                if record.seeders > kept.seeders or record.peers > kept.peers:
+                    entry[3] = kept.merge(record)
+                    entry[0] = self.scorer(entry[3])
+                    heapq.heapify(self._heap)
+                continue
+            entry = [self.scorer(record), self._seq, key, record]
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[0] > self._heap[0][0]:
+                evicted = heapq.heapreplace(self._heap, entry)
+                del self._entries[evicted[2]]
+            else:
+                continue
+            self._entries[key] = entry
+            added.append(record)
+        return added
+
+    def results(self) -> list:
+        """
+        按评分从高到低返回前K条结果
+        """
+        return [entry[3] for entry in sorted(self._heap, key=lambda entry: (-entry[0], entry[1]))]
+
+
+class _CircuitBreaker:
+    """
+    索引器熔断器
+
+    连续失败（含超时）达到阈值后熔断，熔断期间跳过该索引器；冷却时间过后进入半开状态，
+    只放行一次探测请求，成功则恢复，失败则重新熔断。
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, cooldown: int):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _state(self, indexer_id) -> dict:
+        state = self._states.get(indexer_id)
+        if state is None:
+            state = {"state": self.CLOSED, "failures": 0, "opened_at": 0.0,
+                     "probing": False, "last_error": ""}
+            self._states[indexer_id] = state
+        return state
+
+    def allow(self, indexer_id) -> bool:
+        """
+        是否允许请求该索引器
+        """
+        if not self.threshold:
+            return True
+        with self._lock:
+            state = self._state(indexer_id)
+            if state["state"] == self.CLOSED:
+                return True
+            if state["state"] == self.OPEN:
+                if time.monotonic() - state["opened_at"] < self.cooldown:
+                    return False
+                state["state"] = self.HALF_OPEN
+                state["probing"] = False
+            # 半开状态只放行一次探测
+            if state["probing"]:
+                return False
+            state["probing"] = True
+            return True
+
+    def record_success(self, indexer_id):
+        """
+        记录一次成功请求
+        """
+        if not self.threshold:
+            return
+        with self._lock:
+            state = self._state(indexer_id)
+            state.update(state=self.CLOSED, failures=0, probing=False, last_error="")
+
+    def record_failure(self, indexer_id, error: str = ""):
+        """
+        记录一次失败请求，达到阈值或探测失败时熔断
+        """
+        if not self.threshold:
+            return
+        with self._lock:
+            state = self._state(indexer_id)
+            state["failures"] += 1
+            state["last_error"] = error
+            state["probing"] = False
+            if state["state"] == self.HALF_OPEN or state["failures"] >= self.threshold:
+                state["state"] = self.OPEN
+                state["opened_at"] = time.monotonic()
+
+    def reset(self, indexer_id=None):
+        """
+        重置指定索引器或全部索引器的熔断状态
+        """
+        with self._lock:
+            if indexer_id is None:
+                self._states.clear()
+            else:
+                self._states.pop(indexer_id, None)
+
+    def status(self) -> List[dict]:
+        """
+        获取所有索引器的熔断状态
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "indexer": indexer_id,
+                "state": state["state"],
+                "failures": state["failures"],
+                "retry_in": max(int(self.cooldown - (now - state["opened_at"])), 0)
+                if state["state"] == self.OPEN else 0,
+                "last_error": state["last_error"]
+            } for indexer_id, state in self._states.items()]
+
+
+class _IndexerStats:
+    """
+    索引器延迟与结果数统计，用于按延迟中位数和产出综合排序索引器
+    """
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self._latency = {}
+        self._yield = {}
+        self._lock = threading.Lock()
+
+    def record(self, indexer_id, latency: float, count: int):
+        """
+        记录一次请求的耗时和结果数
+        """
+        with self._lock:
+            self._latency.setdefault(indexer_id, deque(maxlen=self.window)).append(latency)
+            self._yield.setdefault(indexer_id, deque(maxlen=self.window)).append(count)
+
+    def p50(self, indexer_id) -> Optional[float]:
+        """
+        延迟中位数，无样本时返回None
+        """
+        with self._lock:
+            samples = sorted(self._latency.get(indexer_id) or [])
+        if not samples:
+            return None
+        return samples[len(samples) // 2]
+
+    def mean_yield(self, indexer_id) -> float:
+        """
+        平均结果数
+        """
+        with self._lock:
+            samples = self._yield.get(indexer_id)
+            return sum(samples) / len(samples) if samples else 0.0
+
+    def rank(self, indexers: list) -> list:
+        """
+        按每条结果的延迟（延迟中位数 / (平均结果数 + 1)）升序排列索引器，
+        响应快、产出多的索引器排在前面；未统计过的索引器排在最前以便尽快取得样本
+        """
+        def _key(indexer):
+            indexer_id = indexer.get("id")
+            latency = self.p50(indexer_id)
+            if latency is None:
+                return -1.0
+            return latency / (self.mean_yield(indexer_id) + 1)
+
+        return sorted(indexers, key=_key)
+
+
+class _SingleFlight:
+    """
+    合并相同键的并发请求，同一时刻只有一个调用真正执行，其余调用等待并共享其结果
+    """
+
+    class _Call:
+        __slots__ = ("event", "result", "error")
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        执行func，若相同键的调用正在进行则等待并返回其结果
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+
+def _major_categories(categories) -> set:
+    """
+    将torznab分类ID归并为主分类（如2040归为2000），忽略站点自定义分类
+    """
+    majors = set()
+    for cat in categories:
+        try:
+            cat = int(cat)
+        except (TypeError, ValueError):
+            continue
+        if 0 < cat < 100000:
+            majors.add(cat // 1000 * 1000)
+    return majors
+
+
+class _ItemFilter:
+    """
+    解析时下推的条目过滤条件：最低做种数、大小范围、分类
+
+    由解析器在读取扩展属性和大小后调用，不满足条件的条目不再读取其余字段；
+    同时统计解析过的条目总数，供分页判断当前页是否已满。
+    """
+
+    def __init__(self, min_seeders: int = 0, min_size: int = 0, max_size: int = 0, categories: set = None):
+        self.min_seeders = min_seeders
+        self.min_size = min_size
+        self.max_size = max_size
+        self.categories = categories or set()
+        self.scanned = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.min_seeders or self.min_size or self.max_size or self.categories)
+
+    def __call__(self, size: int, seeders: int, categories: list) -> bool:
+        self.scanned += 1
+        if seeders < self.min_seeders:
+            return False
+        if self.min_size and size < self.min_size:
+            return False
+        if self.max_size and size > self.max_size:
+            return False
+        if self.categories:
+            # 条目没有可识别的分类时不过滤
+            majors = _major_categories(categories)
+            if majors and self.categories.isdisjoint(majors):
+                return False
+        return True
+
+
+class _CapsIndex:
+    """
+    索引器能力索引
+
+    缓存各索引器 t=caps 返回的分类和搜索模式，按刷新间隔在独立的小线程池中重新获取，
+    不占用搜索线程池；尚未获取到能力的索引器视为支持所有请求，避免首次搜索等待能力发现。
+    """
+
+    def __init__(self, loader, ttl: int, retry: int = 600, workers: int = 2):
+        self._loader = loader
+        self.ttl = ttl
+        self.retry = retry
+        self.workers = workers
+        self._caps = {}
+        self._pending = set()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse(xml_content) -> dict:
+        """
+        解析t=caps响应，返回 {"categories": 主分类集合, "modes": {模式: 支持的参数集合}}
+        """
+        root = ET.fromstring(xml_content)
+        modes = {}
+        searching = root.find("searching")
+        if searching is not None:
+            for mode in searching:
+                if mode.get("available", "no").lower() != "yes":
+                    continue
+                params = mode.get("supportedParams") or "q"
+                modes[mode.tag] = {param.strip() for param in params.split(",") if param.strip()}
+        categories = [cat.get("id") for cat in root.iter("category")]
+        categories += [sub.get("id") for sub in root.iter("subcat")]
+        return {"categories": _major_categories(categories), "modes": modes}
+
+    def get(self, indexer_id) -> Optional[dict]:
+        """
+        获取索引器能力，未知时返回None
+        """
+        with self._lock:
+            entry = self._caps.get(indexer_id)
+        return entry[1] if entry else None
+
+    def supports(self, indexer_id, categories: set = None, modes: tuple = ("search",)) -> bool:
+        """
+        索引器是否支持任一指定的搜索模式，且分类与请求分类有交集
+        """
+        caps = self.get(indexer_id)
+        if not caps:
+            return True
+        if not any(mode in caps["modes"] for mode in modes):
+            return False
+        if categories and caps["categories"] and not categories & caps["categories"]:
+            return False
+        return True
+
+    def refresh_stale(self, indexers: list):
+        """
+        在后台获取缺失或过期的索引器能力
+        """
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            for indexer in indexers:
+                indexer_id = indexer.get("id")
+                entry = self._caps.get(indexer_id)
+                if indexer_id in self._pending:
+                    continue
+                if entry and now < entry[0]:
+                    continue
+                self._pending.add(indexer_id)
+                stale.append(indexer_id)
+            if stale and not self._executor:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="jackett-caps")
+            executor = self._executor
+        for indexer_id in stale:
+            try:
+                executor.submit(self._refresh, indexer_id)
+            except RuntimeError:
+                # 线程池已关闭
+                with self._lock:
+                    self._pending.discard(indexer_id)
+
+    def _refresh(self, indexer_id):
+        """
+        获取单个索引器的能力，失败时稍后重试
+        """
+        caps = None
+        try:
+            caps = self._loader(indexer_id)
+        finally:
+            with self._lock:
+                expires = time.monotonic() + (self.ttl if caps else self.retry)
+                old = self._caps.get(indexer_id)
+                self._caps[indexer_id] = (expires, caps or (old[1] if old else None))
+                self._pending.discard(indexer_id)
+
+    def clear(self):
+        """
+        清空能力索引
+        """
+        with self._lock:
+            self._caps.clear()
+
+    def close(self):
+        """
+        关闭能力获取线程池，不等待未完成的任务
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _SearchQuery:
+    """
+    单次搜索的查询条件
+    """
+    __slots__ = ("keyword", "canonical", "category", "media", "limit")
+
+    def __init__(self, keyword: str, category: str = "", media: dict = None, limit: int = 0):
+        self.keyword = keyword
+        self.canonical = canonicalize_query(keyword)
+        self.category = str(category or "")
+        self.media = media
+        self.limit = limit
+
+    def key(self, indexer_id) -> tuple:
+        """
+        生成缓存键：规范化的关键字、索引器ID、分类、结构化查询参数及结果数需求
+        """
+        media = self.media
+        media_key = (media["mode"], tuple(sorted(media["params"].items()))) if media else None
+        return self.canonical, indexer_id, self.category, media_key, self.limit
+
+
+class _PageSizer:
+    """
+    自适应分页大小
+
+    以指数加权平均记录各索引器每次搜索的结果数，下次搜索的单页大小取该均值略大的值，
+    并限制在初始大小和最大大小之间。
+    """
+
+    def __init__(self, initial: int, maximum: int = 100, alpha: float = 0.3):
+        self.initial = initial
+        self.maximum = max(maximum, initial)
+        self.alpha = alpha
+        self._average = {}
+        self._lock = threading.Lock()
+
+    def limit(self, indexer_id) -> int:
+        """
+        获取索引器的单页大小
+        """
+        with self._lock:
+            average = self._average.get(indexer_id)
+        if average is None:
+            return self.initial
+        return max(self.initial, min(self.maximum, int(average * 1.25) + 1))
+
+    def observe(self, indexer_id, total: int):
+        """
+        记录一次搜索的结果数
+        """
+        with self._lock:
+            average = self._average.get(indexer_id)
+            self._average[indexer_id] = total if average is None \
+                else average * (1 - self.alpha) + total * self.alpha
+
+
+class _ResultCache:
+    """
+    搜索结果缓存，按TTL过期，按估算字节数限制容量并以LRU淘汰
+
+    过期后的 stale_ttl 秒内条目仍可读取（stale-while-revalidate），由调用方负责后台刷新。
+    """
+
+    def __init__(self, ttl: int, max_bytes: int, stale_ttl: int = 0):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _estimate_size(items: list) -> int:
+        """
+        估算结果列表占用的字节数
+        """
+        return sys.getsizeof(items) + sum(item.size_of() for item in items)
+
+    def get(self, key: tuple) -> Tuple[Optional[list], bool]:
+        """
+        读取缓存，返回 (结果, 是否已过期)；未命中或超出stale窗口时结果为None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None, False
+            expires, size, items = entry
+            if now >= expires + self.stale_ttl:
+                del self._data[key]
+                self._bytes -= size
+                return None, False
+            self._data.move_to_end(key)
+            return items, now >= expires
+
+    def put(self, key: tuple, items: list):
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+        """
+        size = self._estimate_size(items)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old:
+                self._bytes -= old[1]
+            self._data[key] = (time.monotonic() + self.ttl, size, items)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+
+class _PersistentCache:
+    """
+    SQLite持久化结果缓存（二级缓存），重启后仍可命中
+
+    每个缓存键一行，记录以JSON序列化后zlib压缩存储；过期时间使用系统时间，
+    总大小超出上限时优先删除已过期、其次最早过期的条目。
+    """
+
+    def __init__(self, path: str, ttl: int, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results ("
+                           "key TEXT PRIMARY KEY, expires REAL NOT NULL, "
+                           "size INTEGER NOT NULL, data BLOB NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_expires ON results (expires)")
+        self._conn.commit()
+
+    @staticmethod
+    def _encode(items: list) -> bytes:
+        """
+        压缩结果列表，同一键下的站点名和索引器ID只存一次
+        """
+        first = items[0]
+        rows = [[item.title, item.enclosure, item.size, item.seeders, item.peers,
+                 item.guid, item.infohash, item.pubdate] for item in items]
+        data = json.dumps([first.site, first.indexer, rows], ensure_ascii=False, separators=(",", ":"))
+        return zlib.compress(data.encode("utf-8"))
+
+    @staticmethod
+    def _decode(data: bytes) -> list:
+        """
+        解压为 _TorrentRecord 列表
+        """
+        site, indexer_id, rows = json.loads(zlib.decompress(data).decode("utf-8"))
+        site = sys.intern(site)
+        if isinstance(indexer_id, str):
+            indexer_id = sys.intern(indexer_id)
+        return [_TorrentRecord(title, enclosure, size, seeders, peers, site, indexer_id,
+                               guid, infohash, pubdate)
+                for title, enclosure, size, seeders, peers, guid, infohash, pubdate in rows]
+
+    def get(self, key: str) -> Optional[list]:
+        """
+        读取缓存，未命中、已过期或数据损坏时返回None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT expires, data FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        expires, data = row
+        if time.time() >= expires:
+            return None
+        try:
+            return self._decode(data)
+        except (zlib.error, ValueError, TypeError):
+            return None
+
+    def put(self, key: str, items: list):
+        """
+        写入缓存，超出容量时清理
+        """
+        if not items:
+            return
+        data = self._encode(items)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO results (key, expires, size, data) VALUES (?, ?, ?, ?)",
+                               (key, time.time() + self.ttl, len(data), data))
+            self._prune()
+            self._conn.commit()
+
+    def _prune(self):
+        """
+        删除过期条目，仍超出容量时按过期时间从早到晚删除，调用方需持有锁
+        """
+        self._conn.execute("DELETE FROM results WHERE expires <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY expires"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def clear(self):
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def close(self):
+        """
+        关闭数据库连接
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class _IndexerCatalog:
+    """
+    Jackett索引器目录缓存
+
+    超过刷新间隔后先返回旧目录并在后台线程刷新，只有首次加载或失效后才同步请求。
+    """
+
+    def __init__(self, loader, ttl: int):
+        self._loader = loader
+        self.ttl = ttl
+        self._indexers = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get(self) -> list:
+        """
+        获取索引器目录
+        """
+        with self._lock:
+            indexers = self._indexers
+            expired = time.monotonic() - self._loaded_at >= self.ttl
+            if indexers is not None and expired and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self.refresh, name="jackett-catalog", daemon=True).start()
+        if indexers is None:
+            return self.refresh()
+        return indexers
+
+    def warm(self):
+        """
+        在后台线程预加载目录
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="jackett-catalog", daemon=True).start()
+
+    def refresh(self) -> list:
+        """
+        同步刷新索引器目录，加载失败时保留旧目录
+        """
+        try:
+            indexers = self._loader()
+        finally:
+            with self._lock:
+                self._refreshing = False
+        with self._lock:
+            if indexers:
+                self._indexers = indexers
+                self._loaded_at = time.monotonic()
+            return self._indexers or []
+
+    def invalidate(self):
+        """
+        使目录失效，下次获取时同步重新加载
+        """
+        with self._lock:
+            self._indexers = None
+            self._loaded_at = 0.0
+
+
+class _JackettSession:
+    """
+    Jackett长连接会话
+
+    复用HTTP连接和登录Cookie，Cookie过期或请求返回401时自动重新登录。
+    登录失败时只使用API Key继续请求，并在退避时间内不再尝试登录。
+    """
+
+    def __init__(self, host: str, headers: dict, password: str = None,
+                 pool_size: int = 8, timeout: int = 15, login_ttl: int = 1800,
+                 login_backoff: int = 60, name: str = "Jackett"):
+        self.host = host
+        self.headers = headers
+        self.password = password
+        self.timeout = timeout
+        self.login_ttl = login_ttl
+        self.login_backoff = login_backoff
+        self.name = name
+        self.session = requests.session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._login_expires = 0.0
+        # 登录失败后，在此时间之前不再尝试登录
+        self._login_retry_at = 0.0
+        # 每次登录成功加1，用于合并并发的401重新登录
+        self._login_generation = 0
+        self._lock = threading.Lock()
+
+    def _login(self) -> bool:
+        """
+        使用管理密码登录，Cookie保存在会话中；失败时清空Cookie并进入退避，返回是否登录成功
+        """
+        self.session.cookies.clear()
+        try:
+            login_response = RequestUtils(headers=self.headers, session=self.session,
+                                          timeout=self.timeout).post_res(
+                url=f"{self.host}/UI/Dashboard",
+                data={"password": self.password}
+            )
+            error = None if login_response is not None and login_response.status_code == 200 else \
+                (login_response.status_code if login_response is not None else "无响应")
+        except Exception as e:
+            error = str(e)
+        if error is not None:
+            self.session.cookies.clear()
+            self._login_expires = 0.0
+            self._login_retry_at = time.monotonic() + self.login_backoff
+            print(f"【{self.name}】Jackett登录失败: {error}，{self.login_backoff}秒内仅使用API Key访问")
+            return False
+        # 以最早过期的Cookie为准，没有过期时间的按login_ttl计算
+        now = time.time()
+        expires = [cookie.expires for cookie in self.session.cookies if cookie.expires]
+        lifetime = min(expires) - now if expires else self.login_ttl
+        self._login_expires = time.monotonic() + max(min(lifetime, self.login_ttl), 0)
+        self._login_retry_at = 0.0
+        self._login_generation += 1
+        return True
+
+    def ensure_login(self):
+        """
+        未登录或Cookie已过期时登录，未配置密码或处于登录失败退避期时不处理
+        """
+        if not self.password:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._login_expires and now >= self._login_retry_at:
+                self._login()
+
+    def _relogin(self, generation: int) -> bool:
+        """
+        请求返回401时重新登录，返回是否需要重试请求；
+        其他线程已在此期间重新登录时直接重试，处于登录失败退避期时不重试
+        """
+        with self._lock:
+            if self._login_generation != generation:
+                return True
+            if time.monotonic() < self._login_retry_at:
+                return False
+            return self._login()
+
+    def get(self, url: str, params: dict = None, **kwargs):
+        """
+        发送GET请求，配置了密码且返回401时重新登录并重试一次
+        """
+        self.ensure_login()
+        generation = self._login_generation
+        response = RequestUtils(headers=self.headers, session=self.session, timeout=self.timeout).get_res(
+            url=url, params=params, **kwargs
+        )
+        if response is not None and response.status_code == 401 and self.password \
+                and self._relogin(generation):
+            response = RequestUtils(headers=self.headers, session=self.session, timeout=self.timeout).get_res(
+                url=url, params=params, **kwargs
+            )
+        return response
+
+    def close(self):
+        """
+        关闭会话及连接池
+        """
+        self.session.close()
+
+
 class Jackett(_PluginBase):
     """
     Jackett 搜索器插件
@@ -17,7 +1184,7 @@ class Jackett(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/Jackett/Jackett/master/src/Jackett.Common/Content/favicon.ico"
     # 插件版本
-    plugin_version = "1.0"
+    plugin_version = "1.19"
     # 插件作者
     plugin_author = "lightolly"
     # 作者主页
@@ -35,127 +1202,809 @@ class Jackett(_PluginBase):
     _api_key = None
     _indexers = None
     _password = None
+    # 搜索并发数
+    _max_workers = 8
+    # 单个索引器超时时间（秒）
+    _timeout = 15
+    # 搜索线程池
+    _executor = None
+    # 是否流式返回部分结果
+    _stream_results = False
+    # 流式返回时每批的最大条目数
+    _stream_batch_size = 50
+    # 结果写入锁
+    _results_lock = threading.Lock()
+    # 结果缓存时间（秒），0为不缓存
+    _cache_ttl = 300
+    # 结果缓存容量（MB）
+    _cache_size = 32
+    # 缓存过期后仍可返回旧结果并后台刷新的时间（秒）
+    _cache_stale_ttl = 0
+    # 结果缓存
+    _cache = None
+    # 无结果缓存时间（秒），0为不缓存，开启结果缓存时不超过结果缓存时间
+    _negative_ttl = 60
+    # 无结果缓存
+    _negative_cache = None
+    # 正在后台刷新的缓存键
+    _refreshing = None
+    # 相同查询的并发请求合并
+    _flight = _SingleFlight()
+    # 索引器目录刷新间隔（秒）
+    _catalog_ttl = 3600
+    # 索引器目录
+    _catalog = None
+    # Jackett会话，按host复用
+    _sessions = {}
+    # torznab解析后端：auto/lxml/stdlib
+    _parser = "auto"
+    # 是否跨索引器去重
+    _dedup = True
+    # 熔断阈值：连续失败次数，0为关闭
+    _breaker_threshold = 3
+    # 熔断冷却时间（秒）
+    _breaker_cooldown = 300
+    # 索引器熔断器
+    _breaker = None
+    # 是否按延迟和结果数排序索引器
+    _rank_indexers = False
+    # 提前返回所需的优质结果数，0为等待全部索引器
+    _early_return = 0
+    # 优质结果的最低做种数
+    _min_seeders = 1
+    # 提前返回后是否取消未完成的索引器，否则在后台完成并写入缓存
+    _cancel_late = False
+    # 索引器统计
+    _stats = None
+    # 是否按索引器能力筛选索引器
+    _use_caps = True
+    # 索引器能力刷新间隔（秒）
+    _caps_ttl = 86400
+    # 索引器能力索引
+    _caps = None
+    # 获取索引器能力的线程数，与搜索线程池分开
+    _caps_workers = 2
+    # 自适应分页的初始单页大小，0为不分页
+    _page_size = 25
+    # 单个索引器最多获取的结果数
+    _max_results = 100
+    # 单个索引器最多请求的页数
+    _MAX_PAGES = 10
+    # 自适应分页
+    _pager = None
+    # 只保留评分最高的结果数，0为保留全部
+    _topk = 0
+    # 评分权重：做种数、大小匹配、新鲜度
+    _score_seeders = 1.0
+    _score_size = 0.0
+    _score_fresh = 0.0
+    # 目标大小（GB），用于大小匹配评分
+    _preferred_size = 0.0
+    # 解析时过滤：最低做种数、大小范围（GB）、按请求分类过滤
+    _filter_seeders = 0
+    _filter_min_size = 0.0
+    _filter_max_size = 0.0
+    _filter_category = False
+    # 持久化结果缓存时间（秒），0为不使用
+    _disk_cache_ttl = 0
+    # 持久化结果缓存容量（MB）
+    _disk_cache_size = 64
+    _disk_cache = None
+
+    def init_plugin(self, config: dict = None) -> None:
+        """
+        插件初始化
+        """
+        if not config:
+            return
+
+        # 读取配置
+        self._enabled = config.get("enabled", False)
+        self._host = config.get("host")
+        self._api_key = config.get("api_key")
+        self._password = config.get("password")
+        self._indexers = config.get("indexers", [])
+        self._max_workers = self._to_int(config.get("max_workers"), 8, minimum=1)
+        self._timeout = self._to_int(config.get("timeout"), 15, minimum=1)
+        self._stream_results = config.get("stream_results", False)
+        self._stream_batch_size = self._to_int(config.get("stream_batch_size"), 50, minimum=1)
+        self._cache_ttl = self._to_int(config.get("cache_ttl"), 300)
+        self._cache_size = self._to_int(config.get("cache_size"), 32, minimum=1)
+        self._cache_stale_ttl = self._to_int(config.get("cache_stale_ttl"), 0)
+
+        # 重建结果缓存
+        self._cache = _ResultCache(ttl=self._cache_ttl,
+                                   max_bytes=self._cache_size * 1024 * 1024,
+                                   stale_ttl=self._cache_stale_ttl) if self._cache_ttl else None
+        self._negative_ttl = self._to_int(config.get("negative_ttl"), 60)
+        if self._cache_ttl:
+            self._negative_ttl = min(self._negative_ttl, self._cache_ttl)
+        self._negative_cache = _ResultCache(ttl=self._negative_ttl,
+                                            max_bytes=1024 * 1024) if self._negative_ttl else None
+        self._refreshing = set()
+        self._catalog_ttl = self._to_int(config.get("catalog_ttl"), 3600)
+        self._catalog = _IndexerCatalog(loader=self._load_indexers, ttl=self._catalog_ttl)
+        self._parser = config.get("parser") or "auto"
+        self._dedup = config.get("dedup", True)
+        self._breaker_threshold = self._to_int(config.get("breaker_threshold"), 3)
+        self._breaker_cooldown = self._to_int(config.get("breaker_cooldown"), 300)
+        self._breaker = _CircuitBreaker(threshold=self._breaker_threshold,
+                                        cooldown=self._breaker_cooldown)
+        self._rank_indexers = config.get("rank_indexers", False)
+        self._early_return = self._to_int(config.get("early_return"), 0)
+        self._min_seeders = self._to_int(config.get("min_seeders"), 1)
+        self._cancel_late = config.get("cancel_late", False)
+        if not self._stats:
+            self._stats = _IndexerStats()
+        self._use_caps = config.get("use_caps", True)
+        self._caps_ttl = self._to_int(config.get("caps_ttl"), 86400, minimum=60)
+        if self._caps:
+            self._caps.close()
+        self._caps = _CapsIndex(loader=self._fetch_caps, ttl=self._caps_ttl,
+                                workers=self._caps_workers) if self._use_caps else None
+        self._page_size = self._to_int(config.get("page_size"), 25)
+        self._max_results = self._to_int(config.get("max_results"), 100, minimum=1)
+        self._pager = _PageSizer(initial=self._page_size,
+                                 maximum=self._max_results) if self._page_size else None
+        self._topk = self._to_int(config.get("topk"), 0)
+        self._score_seeders = self._to_float(config.get("score_seeders"), 1.0)
+        self._score_size = self._to_float(config.get("score_size"), 0.0)
+        self._score_fresh = self._to_float(config.get("score_fresh"), 0.0)
+        self._preferred_size = self._to_float(config.get("preferred_size"), 0.0)
+        self._filter_seeders = self._to_int(config.get("filter_seeders"), 0)
+        self._filter_min_size = max(self._to_float(config.get("filter_min_size"), 0.0), 0.0)
+        self._filter_max_size = max(self._to_float(config.get("filter_max_size"), 0.0), 0.0)
+        self._filter_category = config.get("filter_category", False)
+        self._disk_cache_ttl = self._to_int(config.get("disk_cache_ttl"), 0)
+        self._disk_cache_size = self._to_int(config.get("disk_cache_size"), 64, minimum=1)
+        self._close_disk_cache()
+        if self._disk_cache_ttl:
+            self._disk_cache = self._open_disk_cache()
+
+        # 重建搜索线程池及会话
+        self._shutdown_executor()
+        self._close_sessions()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                            thread_name_prefix="jackett-search")
+        
+        # 预加载索引器目录
+        if self._host and self._api_key:
+            self._catalog.warm()
+
+        # 注册事件响应
+        if self._enabled and self._host and self._api_key:
+            eventmanager.register(EventType.SearchTorrent, self.search)
+
+    def unload_plugin(self):
+        """
+        插件卸载
+        """
+        eventmanager.unregister(EventType.SearchTorrent, self.search)
+        self._shutdown_executor()
+        if self._caps:
+            self._caps.close()
+        self._close_sessions()
+        self._close_disk_cache()
+
+    def _shutdown_executor(self):
+        """
+        关闭搜索线程池，不等待未完成的任务
+        """
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _to_int(value, default: int, minimum: int = 0) -> int:
+        """
+        将配置值转换为整数，非法值使用默认值
+        """
+        try:
+            return max(int(value), minimum)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def _to_float(value, default: float) -> float:
+        """
+        将配置值转换为浮点数，非法值使用默认值
+        """
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def search(self, event):
+        """
+        处理搜索事件
+
+        开启流式返回时，每个索引器的结果解析完成后立即按批追加到 event["results"]，
+        并回调 event["on_results"](batch, complete)（如有）；全部索引器结束后
+        设置 event["complete"] = True 并以空批次、complete=True 回调一次作为结束标记，
+        没有可查询的索引器或搜索异常提前结束时同样写入结束标记。
+        """
+        if not self._enabled or not self._host or not self._api_key:
+            return
+
+        # 准备搜索结果
+        merger = self._create_merger()
+        try:
+            self._search_indexers(event, merger)
+        finally:
+            # 将搜索结果添加到事件
+            records = merger.results()
+            if self._stream_results:
+                if self._topk:
+                    self._publish_results(event, records)
+                self._publish_results(event, [], complete=True)
+            elif records:
+                result_list = event.get("results") or []
+                result_list.extend(record.to_dict() for record in records)
+                event["results"] = result_list
+
+    def _search_indexers(self, event, merger: _ResultMerger):
+        """
+        并发查询匹配的索引器并将结果合并到merger，流式返回时按完成顺序发布各索引器的结果
+        """
+        # 获取搜索关键字，原样发送给索引器，规范化形式只用于缓存和合并相同请求
+        keyword = (event.get("keyword") or "").strip()
+        if not keyword:
+            return
+        media = self._media_query(event)
+        query = _SearchQuery(keyword=keyword,
+                             category=event.get("category") or "",
+                             media=media,
+                             limit=self._to_int(event.get("limit"), 0))
+        categories = self._request_categories(event)
+        modes = ("search", media["mode"]) if media else ("search",)
+
+        # 获取索引器列表
+        indexers = self._get_catalog().get()
+        if not indexers:
+            return
+
+        # 如果有指定索引器范围，则只处理指定的索引器
+        if self._indexers:
+            indexers = [indexer for indexer in indexers if indexer.get("id") in self._indexers]
+        if not indexers:
+            return
+
+        # 只查询能力与请求匹配的索引器，并在后台补全缺失或过期的能力信息
+        if self._caps:
+            self._caps.refresh_stale(indexers)
+            capable = [indexer for indexer in indexers
+                       if self._caps.supports(indexer.get("id"), categories, modes)]
+            if len(capable) < len(indexers):
+                print(f"【{self.plugin_name}】按索引器能力跳过{len(indexers) - len(capable)}个索引器")
+            indexers = capable
+            if not indexers:
+                return
+
+        # 按延迟中位数和结果数排序，优先查询响应快、产出多的索引器
+        if self._rank_indexers and self._stats:
+            indexers = self._stats.rank(indexers)
+
+        # 并发查询所有索引器，按完成顺序合并结果
+        executor = self._executor or ThreadPoolExecutor(max_workers=self._max_workers,
+                                                        thread_name_prefix="jackett-search")
+        futures = {
+            executor.submit(self._cached_search, indexer, query): indexer
+            for indexer in indexers
+        }
+        # 整体等待时间：每批并发的超时时间之和，再留出解析余量；
+        # 分页时单个索引器在分页时间预算（超时时间）用完前可能再发起一次请求，按两倍超时时间计算
+        rounds = -(-len(futures) // self._max_workers)
+        per_indexer = self._timeout * 2 if self._pager else self._timeout
+        deadline = per_indexer * rounds + 5
+        good = 0
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                indexer_id = futures[future].get("id")
+                try:
+                    search_results = future.result()
+                except Exception as e:
+                    print(f"【{self.plugin_name}】搜索索引器 {indexer_id} 异常: {str(e)}")
+                    continue
+                if not search_results:
+                    continue
+                added = merger.add(search_results)
+                # 前K模式下结果可能被后续更优的结果替换，结束时再统一发布
+                if self._stream_results and not self._topk:
+                    self._publish_results(event, added, merger=merger)
+                # 优质结果足够时提前返回
+                if self._early_return:
+                    good += sum(1 for record in added if record.seeders >= self._min_seeders)
+                    if good >= self._early_return:
+                        pending = [futures[f].get("id") for f in futures if not f.done()]
+                        if pending:
+                            print(f"【{self.plugin_name}】已获得{good}条优质结果，提前返回，"
+                                  f"{'取消' if self._cancel_late else '后台完成'}剩余索引器: {pending}")
+                            if self._cancel_late:
+                                for f in futures:
+                                    f.cancel()
+                        break
+        except FutureTimeoutError:
+            pending = [futures[f].get("id") for f in futures if not f.done()]
+            print(f"【{self.plugin_name}】搜索超时，放弃未返回的索引器: {pending}")
+            for future in futures:
+                future.cancel()
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _create_merger(self) -> _ResultMerger:
+        """
+        创建结果合并器，开启前K模式时只保留评分最高的结果
+        """
+        if not self._topk:
+            return _ResultMerger(dedup=self._dedup)
+        scorer = _ResultScorer(seeders=self._score_seeders,
+                               size=self._score_size,
+                               fresh=self._score_fresh,
+                               preferred_size=int(self._preferred_size * 1024 ** 3))
+        return _TopKMerger(k=self._topk, scorer=scorer, dedup=self._dedup)
+
+    def _publish_results(self, event, items, complete: bool = False, merger: _ResultMerger = None):
+        """
+        流式发布一批搜索结果，complete为True时写入结束标记
+        """
+        lock = self._results_lock
+        for start in range(0, len(items), self._stream_batch_size):
+            records = items[start:start + self._stream_batch_size]
+            batch = [record.to_dict() for record in records]
+            if merger:
+                for record, item in zip(records, batch):
+                    merger.track(record, item)
+            with lock:
+                result_list = event.get("results")
+                if result_list is None:
+                    result_list = []
+                    event["results"] = result_list
+                result_list.extend(batch)
+            self._notify_results(event, batch, False)
+        if complete:
+            with lock:
+                if event.get("results") is None:
+                    event["results"] = []
+                event["complete"] = True
+            self._notify_results(event, [], True)
+
+    def _notify_results(self, event, batch, complete: bool):
+        """
+        调用事件中的结果回调
+        """
+        callback = event.get("on_results")
+        if not callable(callback):
+            return
+        try:
+            callback(batch, complete)
+        except Exception as e:
+            print(f"【{self.plugin_name}】结果回调异常: {str(e)}")
+
+    @staticmethod
+    def _request_categories(event) -> set:
+        """
+        获取请求的主分类：优先使用事件中的分类，其次按媒体类型推断
+        """
+        category = event.get("category")
+        if category:
+            return _major_categories(str(category).split(","))
+        mtype = event.get("mtype")
+        mtype = getattr(mtype, "value", mtype)
+        if mtype in ("movie", "电影"):
+            return {2000}
+        if mtype in ("tv", "电视剧"):
+            return {5000}
+        return set()
+
+    @staticmethod
+    def _media_query(event) -> Optional[dict]:
+        """
+        从事件的媒体信息生成结构化查询：
+        {"mode": "movie-search"/"tv-search", "cat": 默认分类, "params": {imdbid/tmdbid/tvdbid/season/ep}}
+        """
+        mediainfo = event.get("mediainfo")
+
+        def _value(key, attr):
+            value = event.get(key)
+            if value in (None, "") and mediainfo is not None:
+                if isinstance(mediainfo, dict):
+                    value = mediainfo.get(attr)
+                else:
+                    value = getattr(mediainfo, attr, None)
+            return value
+
+        mtype = _value("mtype", "type")
+        mtype = getattr(mtype, "value", mtype)
+        if mtype in ("movie", "电影"):
+            mode, cat = "movie-search", "2000"
+        elif mtype in ("tv", "电视剧"):
+            mode, cat = "tv-search", "5000"
+        else:
+            return None
+
+        params = {}
+        imdbid = _value("imdbid", "imdb_id")
+        if imdbid:
+            imdbid = str(imdbid)
+            params["imdbid"] = imdbid if imdbid.startswith("tt") else f"tt{imdbid}"
+        for key, attr in (("tmdbid", "tmdb_id"), ("tvdbid", "tvdb_id")):
+            value = _value(key, attr)
+            if value:
+                params[key] = str(value)
+        if mode == "tv-search":
+            for key, attr in (("season", "season"), ("ep", "episode")):
+                value = event.get(attr)
+                if value not in (None, ""):
+                    params[key] = str(value)
+        return {"mode": mode, "cat": cat, "params": params}
+
+    def _build_params(self, indexer_id, query: _SearchQuery) -> dict:
+        """
+        构建torznab查询参数
+
+        索引器能力支持时使用 t=movie/t=tvsearch 及 imdbid、tmdbid、season、ep 等参数，
+        有ID参数时不再附带关键字；能力未知或不支持时回退为 t=search 关键字搜索。
+        """
+        keyword, category, media = query.keyword, query.category, query.media
+        params = {
+            "apikey": self._api_key,
+            "t": "search",
+            "q": keyword
+        }
+        caps = self._caps.get(indexer_id) if self._caps else None
+        if media and caps and media["mode"] in caps["modes"]:
+            supported = caps["modes"][media["mode"]]
+            extra = {key: value for key, value in media["params"].items() if key in supported}
+            has_id = any(key in extra for key in ("imdbid", "tmdbid", "tvdbid"))
+            if has_id or "q" in supported:
+                params["t"] = "movie" if media["mode"] == "movie-search" else "tvsearch"
+                if has_id:
+                    params.pop("q")
+                params.update(extra)
+        if category:
+            params["cat"] = category
+        elif media and caps and int(media["cat"]) in caps["categories"]:
+            params["cat"] = media["cat"]
+        return params
+
+    def _cached_search(self, indexer, query: _SearchQuery):
+        """
+        优先从缓存读取单个索引器的结果，未命中时查询并写入缓存；
+        近期无结果的查询直接返回空列表，相同查询的并发请求合并为一次
+        """
+        key = query.key(indexer.get("id"))
+        negative_cache = self._negative_cache
+        if negative_cache:
+            empty, _ = negative_cache.get(key)
+            if empty is not None:
+                return []
 
-    def init_plugin(self, config: dict = None) -> None:
+        cache = self._cache
+        if cache:
+            items, stale = cache.get(key)
+            if items is not None:
+                if stale:
+                    self._refresh_cache(key, indexer, query)
+                return items
+
+        # 内存未命中时读取持久化缓存，命中后回填内存缓存
+        disk_cache = self._disk_cache
+        if disk_cache:
+            items = self._read_disk_cache(disk_cache, key)
+            if items is not None:
+                if cache:
+                    cache.put(key, items)
+                return items
+
+        return self._flight.do(key, lambda: self._fetch_and_store(key, indexer, query))
+
+    def _fetch_and_store(self, key, indexer, query: _SearchQuery):
         """
-        插件初始化
+        查询单个索引器并写入缓存
         """
-        if not config:
+        items = self._search_indexer(indexer, query)
+        self._store_results(key, items)
+        return items
+
+    def _store_results(self, key, items):
+        """
+        写入结果缓存，空结果写入短时间的无结果缓存
+        """
+        if items is None or isinstance(items, _PartialResults):
             return
+        if not items:
+            if self._negative_cache:
+                self._negative_cache.put(key, items)
+            return
+        if self._cache:
+            self._cache.put(key, items)
+        disk_cache = self._disk_cache
+        if disk_cache:
+            try:
+                disk_cache.put(self._disk_key(key), items)
+            except sqlite3.Error as e:
+                print(f"【{self.plugin_name}】写入持久化缓存异常: {str(e)}")
 
-        # 读取配置
-        self._enabled = config.get("enabled", False)
-        self._host = config.get("host")
-        self._api_key = config.get("api_key")
-        self._password = config.get("password")
-        self._indexers = config.get("indexers", [])
-        
-        # 注册事件响应
-        if self._enabled and self._host and self._api_key:
-            eventmanager.register(EventType.SearchTorrent, self.search)
+    def _read_disk_cache(self, disk_cache: _PersistentCache, key) -> Optional[list]:
+        """
+        读取持久化缓存，数据库异常时视为未命中
+        """
+        try:
+            return disk_cache.get(self._disk_key(key))
+        except sqlite3.Error as e:
+            print(f"【{self.plugin_name}】读取持久化缓存异常: {str(e)}")
+            return None
 
-    def unload_plugin(self):
+    def _disk_key(self, key) -> str:
         """
-        插件卸载
+        生成持久化缓存键：在内存缓存键之外加入影响结果内容的配置，
+        配置变更后旧条目不会被命中，等待过期清理
         """
-        eventmanager.unregister(EventType.SearchTorrent, self.search)
+        scope = [self._host, self._filter_seeders, self._filter_min_size, self._filter_max_size,
+                 self._filter_category, self._page_size, self._max_results]
+        return json.dumps([scope, key], ensure_ascii=False, separators=(",", ":"))
 
-    def search(self, event):
+    def _open_disk_cache(self) -> Optional[_PersistentCache]:
         """
-        处理搜索事件
+        打开持久化缓存数据库，失败时不使用持久化缓存
         """
-        if not self._enabled or not self._host or not self._api_key:
-            return
+        try:
+            data_path = self.get_data_path()
+        except AttributeError:
+            # 旧版本MoviePilot没有插件数据目录，存放在插件目录下
+            data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+        try:
+            os.makedirs(data_path, exist_ok=True)
+            return _PersistentCache(path=os.path.join(str(data_path), "results.db"),
+                                    ttl=self._disk_cache_ttl,
+                                    max_bytes=self._disk_cache_size * 1024 * 1024)
+        except (OSError, sqlite3.Error) as e:
+            print(f"【{self.plugin_name}】打开持久化缓存失败: {str(e)}")
+            return None
 
-        # 获取搜索关键字
-        keyword = event.get("keyword")
-        if not keyword:
-            return
+    def _close_disk_cache(self):
+        """
+        关闭持久化缓存数据库
+        """
+        if self._disk_cache:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def _refresh_cache(self, key, indexer, query: _SearchQuery):
+        """
+        后台刷新过期的缓存条目，同一键只刷新一次
+        """
+        with self._results_lock:
+            if key in self._refreshing or not self._executor:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                self._flight.do(key, lambda: self._fetch_and_store(key, indexer, query))
+            except Exception as e:
+                print(f"【{self.plugin_name}】后台刷新索引器 {indexer.get('id')} 缓存异常: {str(e)}")
+            finally:
+                with self._results_lock:
+                    self._refreshing.discard(key)
+
+        try:
+            self._executor.submit(_refresh)
+        except RuntimeError:
+            # 线程池已关闭
+            with self._results_lock:
+                self._refreshing.discard(key)
+
+    def _search_indexer(self, indexer, query: _SearchQuery):
+        """
+        经熔断器查询单个索引器，返回解析后的结果，请求失败或已熔断时返回None
+        """
+        indexer_id = indexer.get("id")
+        breaker = self._breaker
+        if breaker and not breaker.allow(indexer_id):
+            return None
+        start = time.monotonic()
+        try:
+            items = self._request_indexer(indexer, query)
+        except Exception as e:
+            if breaker:
+                breaker.record_failure(indexer_id, str(e))
+            if self._stats:
+                self._stats.record(indexer_id, time.monotonic() - start, 0)
+            raise
+        if self._stats:
+            self._stats.record(indexer_id, time.monotonic() - start, len(items or []))
+        if breaker:
+            if items is None:
+                breaker.record_failure(indexer_id, "请求失败或超时")
+            else:
+                breaker.record_success(indexer_id)
+        return items
+
+    def _request_indexer(self, indexer, query: _SearchQuery):
+        """
+        请求单个索引器的torznab接口并解析结果，请求失败时返回None
+
+        开启自适应分页时，先按该索引器学习到的单页大小请求第一页，
+        只有当前页已满且结果数未达到需求时才通过offset继续请求下一页；
+        按上一页耗时预计下一页会使分页总耗时超过索引器超时时间时不再请求，
+        此时已获取的结果不完整，不写入缓存。
+        """
+        indexer_id = indexer.get("id")
+        session = self._get_session()
+
+        # 构建搜索URL
+        search_url = f"{session.host}/api/v2.0/indexers/{indexer_id}/results/torznab/api"
+        params = self._build_params(indexer_id, query)
+        predicate = self._create_filter(query)
+
+        pager = self._pager
+        if not pager:
+            return self._request_page(session, search_url, params, indexer, predicate)
+
+        limit = pager.limit(indexer_id)
+        wanted = query.limit or self._max_results
+        results = []
+        # 索引器实际返回的条目数，含被过滤掉的条目
+        offset = 0
+        start = time.monotonic()
+        page_start = start
+        for page in range(self._MAX_PAGES):
+            if page:
+                now = time.monotonic()
+                if now - start + (now - page_start) > self._timeout:
+                    print(f"【{self.plugin_name}】索引器 {indexer_id} 分页耗时超过{self._timeout}秒，"
+                          f"停止请求第{page + 1}页")
+                    results = _PartialResults(results)
+                    break
+                page_start = now
+            page_params = dict(params, limit=limit)
+            if offset:
+                page_params["offset"] = offset
+            scanned = predicate.scanned if predicate else 0
+            items = self._request_page(session, search_url, page_params, indexer, predicate)
+            if items is None:
+                # 后续页失败时保留已获取的结果，但结果不完整，不写入缓存
+                if page == 0:
+                    return None
+                results = _PartialResults(results)
+                break
+            results.extend(items)
+            received = predicate.scanned - scanned if predicate else len(items)
+            offset += received
+            # 当前页未满说明已无更多结果
+            if received < limit or len(results) >= wanted:
+                break
+        pager.observe(indexer_id, offset)
+        return results
+
+    def _create_filter(self, query: _SearchQuery) -> Optional[_ItemFilter]:
+        """
+        根据配置和请求分类创建解析时的条目过滤条件，没有任何条件时返回None
+        """
+        categories = set()
+        if self._filter_category and query.category:
+            categories = _major_categories(query.category.split(","))
+        item_filter = _ItemFilter(min_seeders=self._filter_seeders,
+                                  min_size=int(self._filter_min_size * 1024 ** 3),
+                                  max_size=int(self._filter_max_size * 1024 ** 3),
+                                  categories=categories)
+        return item_filter if item_filter else None
+
+    def _request_page(self, session: _JackettSession, search_url: str, params: dict, indexer,
+                      predicate: _ItemFilter = None):
+        """
+        请求一页torznab结果，流式读取并解析响应；
+        请求失败、响应读取中断或解析失败时返回None，不完整的结果不写入缓存也不计为成功
+        """
+        search_response = session.get(url=search_url, params=params, stream=True)
+        if search_response is None:
+            return None
+        try:
+            if search_response.status_code != 200:
+                return None
+            # 解析响应，提取结果
+            raw = search_response.raw
+            raw.decode_content = True
+            return self._parse_results(indexer, raw, predicate)
+        except Exception as e:
+            print(f"【{self.plugin_name}】读取索引器 {indexer.get('id')} 搜索结果失败: {str(e)}")
+            return None
+        finally:
+            search_response.close()
+
+    def _fetch_caps(self, indexer_id) -> Optional[dict]:
+        """
+        获取单个索引器的torznab能力
+        """
+        session = self._get_session()
+        try:
+            response = session.get(
+                url=f"{session.host}/api/v2.0/indexers/{indexer_id}/results/torznab/api",
+                params={"apikey": self._api_key, "t": "caps"}
+            )
+            if not response or response.status_code != 200:
+                return None
+            return _CapsIndex.parse(response.content)
+        except Exception as e:
+            print(f"【{self.plugin_name}】获取索引器 {indexer_id} 能力异常: {str(e)}")
+            return None
 
-        # 规范化host地址
+    def _get_host(self) -> str:
+        """
+        规范化host地址
+        """
         host = self._host
         if host.endswith('/'):
             host = host[:-1]
+        return host
 
-        # 设置请求头
-        headers = {
+    def _get_headers(self) -> dict:
+        """
+        设置请求头
+        """
+        return {
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+            "Accept-Encoding": "gzip, deflate",
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.69 Safari/537.36",
             "X-Api-Key": self._api_key,
             "Accept": "application/json, text/javascript, */*; q=0.01"
         }
 
-        # 准备Cookie，如果需要密码登录
-        cookies = None
-        if self._password:
-            try:
-                login_url = f"{host}/UI/Dashboard"
-                login_data = {"password": self._password}
-                
-                login_response = RequestUtils(headers=headers).post_res(
-                    url=login_url, 
-                    data=login_data
-                )
-                
-                if login_response and login_response.status_code == 200:
-                    cookies = login_response.cookies
-            except Exception as e:
-                print(f"【{self.plugin_name}】Jackett登录异常: {str(e)}")
-
-        # 准备搜索结果
-        results = []
-
-        # 获取索引器列表
-        indexers = self._fetch_indexers(host, headers, cookies)
-        if not indexers:
-            return
-
-        # 遍历所有索引器
-        for indexer in indexers:
-            indexer_id = indexer.get("id")
-            
-            # 如果有指定索引器范围，则只处理指定的索引器
-            if self._indexers and indexer_id not in self._indexers:
-                continue
-
-            # 构建搜索URL
-            search_url = f"{host}/api/v2.0/indexers/{indexer_id}/results/torznab/api"
-            params = {
-                "apikey": self._api_key,
-                "t": "search",
-                "q": keyword
-            }
+    def _get_session(self) -> _JackettSession:
+        """
+        获取当前host的Jackett会话，不存在时创建
+        """
+        host = self._get_host()
+        session = self._sessions.get(host)
+        if not session:
+            with self._results_lock:
+                session = self._sessions.get(host)
+                if not session:
+                    session = _JackettSession(host=host,
+                                              headers=self._get_headers(),
+                                              password=self._password,
+                                              pool_size=self._max_workers + self._caps_workers,
+                                              timeout=self._timeout,
+                                              name=self.plugin_name)
+                    self._sessions[host] = session
+        return session
 
-            # 执行搜索
+    def _close_sessions(self):
+        """
+        关闭所有Jackett会话
+        """
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
             try:
-                search_response = RequestUtils(headers=headers, cookies=cookies).get_res(
-                    url=search_url,
-                    params=params
-                )
-                
-                if not search_response or search_response.status_code != 200:
-                    continue
-
-                # 解析响应，提取结果
-                search_results = self._parse_results(indexer, search_response.text)
-                if search_results:
-                    results.extend(search_results)
+                session.close()
             except Exception as e:
-                print(f"【{self.plugin_name}】搜索索引器 {indexer_id} 异常: {str(e)}")
+                print(f"【{self.plugin_name}】关闭Jackett会话异常: {str(e)}")
+
+    def _get_catalog(self) -> _IndexerCatalog:
+        """
+        获取索引器目录，未初始化时按当前配置创建
+        """
+        if not self._catalog:
+            self._catalog = _IndexerCatalog(loader=self._load_indexers, ttl=self._catalog_ttl)
+        return self._catalog
 
-        # 将搜索结果添加到事件
-        if results:
-            result_list = event.get("results") or []
-            result_list.extend(results)
-            event["results"] = result_list
+    def _load_indexers(self) -> list:
+        """
+        从Jackett加载索引器目录
+        """
+        if not self._host or not self._api_key:
+            return []
+        return self._fetch_indexers(self._get_session())
 
-    def _fetch_indexers(self, host, headers, cookies):
+    def _fetch_indexers(self, session: _JackettSession):
         """
         获取Jackett索引器列表
         """
         try:
-            indexer_query_url = f"{host}/api/v2.0/indexers?configured=true"
-            response = RequestUtils(headers=headers, cookies=cookies).get_res(indexer_query_url)
+            indexer_query_url = f"{session.host}/api/v2.0/indexers?configured=true"
+            response = session.get(indexer_query_url)
             
             if not response or response.status_code != 200:
                 return []
@@ -165,48 +2014,39 @@ class Jackett(_PluginBase):
             print(f"【{self.plugin_name}】获取Jackett索引器异常: {str(e)}")
             return []
 
-    def _parse_results(self, indexer, xml_content):
+    def _parse_results(self, indexer, source, predicate: _ItemFilter = None):
         """
-        解析搜索结果XML
+        流式解析torznab搜索结果
+
+        source 可以是响应的原始字节流，也可以是完整的XML文本；逐个条目解析，
+        解析完的条目立即清理，不保留整棵文档树。读取或解析中途出错（连接中断、
+        响应被截断、不是torznab响应）时抛出异常，不返回不完整的结果。
+        predicate 为解析时下推的过滤条件，不满足的条目不会生成记录。
+        返回 _TorrentRecord 列表，由调用方在交给MoviePilot前转换为字典。
         """
-        try:
-            import xml.etree.ElementTree as ET
-            
-            results = []
-            root = ET.fromstring(xml_content)
-            
-            # 遍历所有条目
-            for item in root.findall(".//item"):
-                title = item.find("title").text if item.find("title") is not None else ""
-                link = item.find("link").text if item.find("link") is not None else ""
-                size_elem = item.find("size")
-                size = int(size_elem.text) if size_elem is not None else 0
-                
-                # 获取种子和做种数
-                seeders = 0
-                peers = 0
-                for attr in item.findall(".//torznab:attr", {"torznab": "http://torznab.com/schemas/2015/feed"}):
-                    if attr.get("name") == "seeders":
-                        seeders = int(attr.get("value", 0))
-                    elif attr.get("name") == "peers":
-                        peers = int(attr.get("value", 0))
-                
-                # 添加到结果列表
-                results.append({
-                    "title": title,
-                    "enclosure": link,
-                    "size": size,
-                    "seeders": seeders,
-                    "peers": peers,
-                    "site": f"[Jackett] {indexer.get('name')}",
-                    "indexer": indexer.get('id'),
-                    "category": ""
-                })
-            
-            return results
-        except Exception as e:
-            print(f"【{self.plugin_name}】解析搜索结果异常: {str(e)}")
-            return []
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+
+        results = []
+        site = sys.intern(f"[Jackett] {indexer.get('name')}")
+        indexer_id = indexer.get('id')
+        if isinstance(indexer_id, str):
+            indexer_id = sys.intern(indexer_id)
+        for title, link, size, seeders, peers, guid, infohash, magneturl, pubdate in self._get_parser()(source, predicate):
+            if not magneturl and link.startswith("magnet:"):
+                magneturl = link
+            # 添加到结果列表
+            results.append(_TorrentRecord(title, link, size, seeders, peers, site, indexer_id,
+                                          guid, _normalize_infohash(infohash, magneturl), pubdate))
+        return results
+
+    def _get_parser(self):
+        """
+        获取torznab解析后端，auto时使用标准库（性能测试中标准库在各规模下均快于lxml）
+        """
+        return PARSER_BACKENDS.get(self._parser) or PARSER_BACKENDS["stdlib"]
 
     def get_state(self) -> bool:
         """
@@ -248,6 +2088,228 @@ class Jackett(_PluginBase):
                 'placeholder': 'Jackett管理界面配置的Admin password，如未配置可为空',
                 'value': self._password
             },
+            {
+                'type': 'text',
+                'name': 'max_workers',
+                'label': '搜索并发数',
+                'placeholder': '同时查询的索引器数量，默认8',
+                'value': self._max_workers
+            },
+            {
+                'type': 'text',
+                'name': 'timeout',
+                'label': '索引器超时（秒）',
+                'placeholder': '单个索引器的请求超时时间，默认15',
+                'value': self._timeout
+            },
+            {
+                'type': 'switch',
+                'name': 'stream_results',
+                'label': '流式返回结果',
+                'value': self._stream_results
+            },
+            {
+                'type': 'text',
+                'name': 'stream_batch_size',
+                'label': '每批结果数',
+                'placeholder': '流式返回时每批推送的最大条目数，默认50',
+                'value': self._stream_batch_size
+            },
+            {
+                'type': 'text',
+                'name': 'cache_ttl',
+                'label': '结果缓存时间（秒）',
+                'placeholder': '相同关键字的搜索结果缓存时间，0为不缓存，默认300',
+                'value': self._cache_ttl
+            },
+            {
+                'type': 'text',
+                'name': 'cache_size',
+                'label': '结果缓存容量（MB）',
+                'placeholder': '结果缓存占用的最大内存，超出后淘汰最久未使用的结果，默认32',
+                'value': self._cache_size
+            },
+            {
+                'type': 'text',
+                'name': 'cache_stale_ttl',
+                'label': '过期缓存可用时间（秒）',
+                'placeholder': '缓存过期后仍先返回旧结果并在后台刷新的时间，0为关闭，默认0',
+                'value': self._cache_stale_ttl
+            },
+            {
+                'type': 'text',
+                'name': 'negative_ttl',
+                'label': '无结果缓存时间（秒）',
+                'placeholder': '索引器对某关键字无结果时，在该时间内不再重复查询，不超过结果缓存时间，0为关闭，默认60',
+                'value': self._negative_ttl
+            },
+            {
+                'type': 'text',
+                'name': 'disk_cache_ttl',
+                'label': '持久化缓存时间（秒）',
+                'placeholder': '将结果同时写入本地SQLite，重启后仍可命中，0为关闭，默认0',
+                'value': self._disk_cache_ttl
+            },
+            {
+                'type': 'text',
+                'name': 'disk_cache_size',
+                'label': '持久化缓存容量（MB）',
+                'placeholder': '压缩后的最大占用，超出后优先清理最早过期的结果，默认64',
+                'value': self._disk_cache_size
+            },
+            {
+                'type': 'text',
+                'name': 'catalog_ttl',
+                'label': '索引器列表刷新间隔（秒）',
+                'placeholder': '超过该时间后在后台重新获取Jackett索引器列表，默认3600',
+                'value': self._catalog_ttl
+            },
+            {
+                'type': 'text',
+                'name': 'breaker_threshold',
+                'label': '熔断阈值',
+                'placeholder': '索引器连续失败或超时达到该次数后暂停使用，0为关闭，默认3',
+                'value': self._breaker_threshold
+            },
+            {
+                'type': 'text',
+                'name': 'breaker_cooldown',
+                'label': '熔断冷却时间（秒）',
+                'placeholder': '熔断后经过该时间再试探性请求一次，默认300',
+                'value': self._breaker_cooldown
+            },
+            {
+                'type': 'switch',
+                'name': 'use_caps',
+                'label': '按索引器能力筛选',
+                'value': self._use_caps
+            },
+            {
+                'type': 'text',
+                'name': 'caps_ttl',
+                'label': '索引器能力刷新间隔（秒）',
+                'placeholder': '重新获取索引器支持的分类和搜索模式的间隔，默认86400',
+                'value': self._caps_ttl
+            },
+            {
+                'type': 'text',
+                'name': 'page_size',
+                'label': '初始单页结果数',
+                'placeholder': '每个索引器首次请求的结果数，按历史结果数自动调整，0为不分页，默认25',
+                'value': self._page_size
+            },
+            {
+                'type': 'text',
+                'name': 'max_results',
+                'label': '单索引器最多结果数',
+                'placeholder': '页面已满时继续翻页，直到达到该数量，默认100',
+                'value': self._max_results
+            },
+            {
+                'type': 'switch',
+                'name': 'rank_indexers',
+                'label': '按响应速度排序索引器',
+                'value': self._rank_indexers
+            },
+            {
+                'type': 'text',
+                'name': 'early_return',
+                'label': '提前返回结果数',
+                'placeholder': '获得该数量的优质结果后立即返回，0为等待全部索引器，默认0',
+                'value': self._early_return
+            },
+            {
+                'type': 'text',
+                'name': 'min_seeders',
+                'label': '优质结果最低做种数',
+                'placeholder': '做种数不低于该值的结果计为优质结果，默认1',
+                'value': self._min_seeders
+            },
+            {
+                'type': 'switch',
+                'name': 'cancel_late',
+                'label': '提前返回后取消剩余索引器',
+                'value': self._cancel_late
+            },
+            {
+                'type': 'text',
+                'name': 'filter_seeders',
+                'label': '过滤最低做种数',
+                'placeholder': '解析时丢弃做种数低于该值的结果，0为不过滤',
+                'value': self._filter_seeders
+            },
+            {
+                'type': 'text',
+                'name': 'filter_min_size',
+                'label': '过滤最小大小（GB）',
+                'placeholder': '解析时丢弃小于该大小的结果，0为不过滤',
+                'value': self._filter_min_size
+            },
+            {
+                'type': 'text',
+                'name': 'filter_max_size',
+                'label': '过滤最大大小（GB）',
+                'placeholder': '解析时丢弃大于该大小的结果，0为不过滤',
+                'value': self._filter_max_size
+            },
+            {
+                'type': 'switch',
+                'name': 'filter_category',
+                'label': '按请求分类过滤结果',
+                'value': self._filter_category
+            },
+            {
+                'type': 'text',
+                'name': 'topk',
+                'label': '只保留前K条结果',
+                'placeholder': '合并时只保留评分最高的K条结果，0为保留全部，默认0',
+                'value': self._topk
+            },
+            {
+                'type': 'text',
+                'name': 'score_seeders',
+                'label': '做种数评分权重',
+                'placeholder': '默认1',
+                'value': self._score_seeders
+            },
+            {
+                'type': 'text',
+                'name': 'score_size',
+                'label': '大小匹配评分权重',
+                'placeholder': '越接近目标大小得分越高，默认0',
+                'value': self._score_size
+            },
+            {
+                'type': 'text',
+                'name': 'preferred_size',
+                'label': '目标大小（GB）',
+                'placeholder': '大小匹配评分使用的目标大小，0为不评分',
+                'value': self._preferred_size
+            },
+            {
+                'type': 'text',
+                'name': 'score_fresh',
+                'label': '新鲜度评分权重',
+                'placeholder': '发布时间越近得分越高，默认0',
+                'value': self._score_fresh
+            },
+            {
+                'type': 'switch',
+                'name': 'dedup',
+                'label': '跨索引器去重',
+                'value': self._dedup
+            },
+            {
+                'type': 'dropdown',
+                'name': 'parser',
+                'label': '结果解析器',
+                'options': [
+                    {'title': '自动（标准库）', 'value': 'auto'},
+                    {'title': 'lxml', 'value': 'lxml'},
+                    {'title': '标准库', 'value': 'stdlib'}
+                ],
+                'value': self._parser
+            },
             {
                 'type': 'dropdown',
                 'name': 'indexers',
@@ -267,35 +2329,8 @@ class Jackett(_PluginBase):
         if not self._host or not self._api_key:
             return options
         
-        host = self._host
-        if host.endswith('/'):
-            host = host[:-1]
-            
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.69 Safari/537.36",
-            "X-Api-Key": self._api_key,
-            "Accept": "application/json, text/javascript, */*; q=0.01"
-        }
-        
-        cookies = None
-        if self._password:
-            try:
-                login_url = f"{host}/UI/Dashboard"
-                login_data = {"password": self._password}
-                
-                login_response = RequestUtils(headers=headers).post_res(
-                    url=login_url, 
-                    data=login_data
-                )
-                
-                if login_response and login_response.status_code == 200:
-                    cookies = login_response.cookies
-            except Exception as e:
-                print(f"【{self.plugin_name}】Jackett登录异常: {str(e)}")
-        
         try:
-            indexers = self._fetch_indexers(host, headers, cookies)
+            indexers = self._get_catalog().get()
             
             for indexer in indexers:
                 options.append({
@@ -305,4 +2340,82 @@ class Jackett(_PluginBase):
         except Exception as e:
             print(f"【{self.plugin_name}】获取索引器选项异常: {str(e)}")
         
-        return options 
\ No newline at end of file
+        return options
+
+    def get_api(self) -> List[dict]:
+        """
+        获取API接口
+        """
+        return [
+            {
+                "path": "/jackett/indexers",
+                "endpoint": self.get_indexers,
+                "methods": ["GET"],
+                "summary": "获取Jackett索引器列表",
+                "description": "获取已缓存的Jackett索引器目录"
+            },
+            {
+                "path": "/jackett/indexers/refresh",
+                "endpoint": self.refresh_indexers,
+                "methods": ["GET"],
+                "summary": "刷新Jackett索引器列表",
+                "description": "使索引器目录缓存失效并立即从Jackett重新加载"
+            },
+            {
+                "path": "/jackett/breakers",
+                "endpoint": self.get_breakers,
+                "methods": ["GET"],
+                "summary": "获取索引器熔断状态",
+                "description": "获取各索引器的熔断状态、连续失败次数和剩余冷却时间"
+            },
+            {
+                "path": "/jackett/breakers/reset",
+                "endpoint": self.reset_breakers,
+                "methods": ["GET"],
+                "summary": "重置索引器熔断状态",
+                "description": "重置指定索引器（indexer参数）或全部索引器的熔断状态"
+            }
+        ]
+
+    def get_breakers(self):
+        """
+        获取索引器熔断状态
+        """
+        if not self._breaker:
+            return {"code": 1, "message": "熔断器未启用"}
+        return {"code": 0, "data": self._breaker.status()}
+
+    def reset_breakers(self, indexer: str = None):
+        """
+        重置索引器熔断状态
+        """
+        if not self._breaker:
+            return {"code": 1, "message": "熔断器未启用"}
+        self._breaker.reset(indexer)
+        return {"code": 0, "message": "熔断状态已重置"}
+
+    def get_indexers(self):
+        """
+        获取索引器列表
+        """
+        if not self._host or not self._api_key:
+            return {"code": 1, "message": "请先配置Jackett地址和API Key"}
+        indexers = self._get_catalog().get()
+        if not indexers:
+            return {"code": 1, "message": "未获取到Jackett索引器"}
+        return {"code": 0, "data": indexers}
+
+    def refresh_indexers(self):
+        """
+        刷新索引器列表
+        """
+        if not self._host or not self._api_key:
+            return {"code": 1, "message": "请先配置Jackett地址和API Key"}
+        catalog = self._get_catalog()
+        catalog.invalidate()
+        if self._caps:
+            self._caps.clear()
+        indexers = catalog.refresh()
+        if not indexers:
+            return {"code": 1, "message": "未获取到Jackett索引器"}
+        return {"code": 0, "message": f"刷新索引器成功，共{len(indexers)}个索引器"}